@@ -1,32 +1,79 @@
 #!/usr/bin/env python3
 
 import asyncio
-import json
-from typing import Any, Tuple
+import re
+from typing import AsyncIterator, Tuple
 
 import click
 import httpx
 
+DEFAULT_HEADERS = {
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+    "MCP-Protocol-Version": "2025-06-18",
+}
+# All requests of a run share one pooled client so they reuse the keep-alive connection
+CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30.0)
+
+
+# SSE events end at a blank line; each event may carry several `data:` lines
+_SSE_EVENT_END = re.compile(rb"\r?\n\r?\n")
+_SSE_DATA_LINE = re.compile(rb"^data: ?(.*?)\r?$", re.MULTILINE)
+
+
+def _sse_event_data(frame: bytes) -> bytes:
+    return b"\n".join(m.group(1) for m in _SSE_DATA_LINE.finditer(frame)).strip()
+
+
+async def iter_sse_data(r: httpx.Response, buf: bytearray | None = None) -> AsyncIterator[bytes]:
+    """Yield the joined `data:` payload of each complete SSE event, scanning raw bytes.
+
+    Multi-line `data:` fields are joined with newlines as the SSE spec requires;
+    `event:`/`id:`/comment lines are skipped without being decoded. Pass `buf` to
+    reuse one scratch buffer across requests.
+    """
+    if buf is None:
+        buf = bytearray()
+    else:
+        buf.clear()
+    async for chunk in r.aiter_bytes():
+        # Resume the terminator search just before the new bytes (a terminator is at most 4 bytes)
+        # so a large event arriving in many chunks is scanned once, not once per chunk.
+        scan = max(len(buf) - 3, 0)
+        buf += chunk
+        start = 0
+        while (m := _SSE_EVENT_END.search(buf, scan)) is not None:
+            data = _sse_event_data(buf[start : m.start()])
+            if data:
+                yield data
+            start = scan = m.end()
+        del buf[:start]
+    if buf:
+        data = _sse_event_data(bytes(buf))
+        if data:
+            yield data
+
 
 async def shttp_post(
-    client: httpx.AsyncClient, url: str, payload: dict, *, headers: dict | None = None
-) -> Tuple[Any | None, int]:
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict,
+    *,
+    headers: dict | None = None,
+    buf: bytearray | None = None,
+) -> Tuple[bytes | None, int]:
     async with client.stream("POST", url, json=payload, headers=headers) as r:
         r.raise_for_status()
-        event_obj = None
-        async for line in r.aiter_lines():
-            if not line:
-                continue
-            if line.startswith("data:"):
-                data = line[5:].strip()
-                if not data:
-                    continue
-                try:
-                    event_obj = json.loads(data)
-                except Exception:
-                    continue
-                break
-        return event_obj, r.status_code
+        # Hand back the first event's raw payload; callers decode only if they need an object
+        event_data = None
+        async for data in iter_sse_data(r, buf):
+            event_data = data
+            break
+        return event_data, r.status_code
+
+
+def _text(payload: bytes | None) -> str | None:
+    return payload.decode("utf-8", errors="replace") if payload is not None else None
 
 
 @click.command()
@@ -34,18 +81,16 @@ async def shttp_post(
 @click.option("--base", default="http://127.0.0.1:3000/mcp/", help="Base URL of MCP endpoint (must end with /)")
 @click.option("--shttp/--no-shttp", default=True, help="Use Streamable HTTP (SSE on POST). If disabled, expect JSON.")
 async def main(session_id: str, base: str, shttp: bool) -> None:
-    default_headers = {
-        "Accept": "application/json, text/event-stream",
-        "Content-Type": "application/json",
-        "MCP-Protocol-Version": "2025-06-18",
-        "Mcp-Session-Id": session_id,
-    }
-    async with httpx.AsyncClient(timeout=20.0, follow_redirects=True, headers=default_headers) as client:
+    default_headers = {**DEFAULT_HEADERS, "Mcp-Session-Id": session_id}
+    async with httpx.AsyncClient(
+        timeout=20.0, follow_redirects=True, limits=CLIENT_LIMITS, headers=default_headers
+    ) as client:
+        sse_buf = bytearray()  # scratch buffer reused by every shttp_post call
         # tools/list
         list_req = {"jsonrpc": "2.0", "id": 100, "method": "tools/list"}
         if shttp:
-            ev, _ = await shttp_post(client, base, list_req, headers=default_headers)
-            print("tools/list (shttp):", ev)
+            ev, _ = await shttp_post(client, base, list_req, buf=sse_buf)
+            print("tools/list (shttp):", _text(ev))
         else:
             r = await client.post(base, json=list_req)
             r.raise_for_status()
@@ -62,8 +107,8 @@ async def main(session_id: str, base: str, shttp: bool) -> None:
             },
         }
         if shttp:
-            ev, _ = await shttp_post(client, base, call, headers=default_headers)
-            print("tools/call (shttp):", ev)
+            ev, _ = await shttp_post(client, base, call, buf=sse_buf)
+            print("tools/call (shttp):", _text(ev))
         else:
             r2 = await client.post(base, json=call)
             r2.raise_for_status()
@@ -1,181 +1,145 @@
 #!/usr/bin/env python3
 
-import json
-import subprocess
+import asyncio
 import time
-from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
+import redis.asyncio as redis
+
+from mcp_db.utils.serialization import json_loads
 
 
 def _now() -> str:
     return time.strftime("%H:%M:%S")
 
 
-def docker_compose_file_default() -> str:
-    # Default to examples/docker-compose.yml relative to this script location
-    here = Path(__file__).resolve().parent
-    compose = here / "docker-compose.yml"
-    return str(compose)
-
-
-def _clean_output(text: str) -> str:
-    # Drop docker compose WARN blocks (including wrapped lines) and empty lines
-    lines: list[str] = []
-    skipping_warn = False
-    for ln in text.splitlines():
-        s = ln.strip()
-        if not s:
-            # stop skipping warn after a blank line
-            skipping_warn = False
-            continue
-        if s.startswith("WARN[") or s.startswith("WARNING"):
-            skipping_warn = True
-            continue
-        if skipping_warn:
-            # skip wrapped lines that belong to the warn message
-            continue
-        # also skip known compose warning fragments if they appear standalone
-        if "the attribute `version` is obsolete" in s:
-            continue
-        lines.append(s)
-    return "\n".join(lines)
-
-
-def run_redis_cli(compose_file: str, args: List[str]) -> str:
-    cmd = [
-        "docker",
-        "compose",
-        "-f",
-        compose_file,
-        "exec",
-        "-T",
-        "redis",
-        "redis-cli",
-        "--raw",
-    ] + args
-    try:
-        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-        return _clean_output(out.decode("utf-8", errors="ignore"))
-    except subprocess.CalledProcessError as e:
-        return _clean_output(e.output.decode("utf-8", errors="ignore"))
+def connect(redis_url: str) -> "redis.Redis":
+    # One persistent connection pool for the lifetime of the monitor
+    return redis.Redis.from_url(redis_url, decode_responses=True)
 
 
-def list_session_keys(compose_file: str, prefix: str) -> List[str]:
-    out = run_redis_cli(compose_file, ["KEYS", f"{prefix}:session:*"])
-    if not out:
-        return []
-    keys = [line.strip() for line in out.splitlines() if line.strip()]
-    # Filter to only our prefix to avoid stray noise
-    return [k for k in keys if k.startswith(f"{prefix}:")]
+async def scan_keys(r: "redis.Redis", pattern: str) -> List[str]:
+    # SCAN instead of KEYS so large keyspaces don't block the server
+    return [key async for key in r.scan_iter(match=pattern, count=500)]
 
 
-def list_event_keys(compose_file: str, prefix: str) -> List[str]:
-    out = run_redis_cli(compose_file, ["KEYS", f"{prefix}:events:*"])
-    if not out:
-        return []
-    keys = [line.strip() for line in out.splitlines() if line.strip()]
-    return [k for k in keys if k.startswith(f"{prefix}:")]
+async def list_session_keys(r: "redis.Redis", prefix: str) -> List[str]:
+    return await scan_keys(r, f"{prefix}:session:*")
 
 
-def get_session_json(compose_file: str, key: str) -> Dict:
-    out = run_redis_cli(compose_file, ["GET", key])
-    try:
-        # Extract JSON object if warning or noise surrounds it
-        if not out:
-            return {}
-        start = out.find("{")
-        end = out.rfind("}")
-        if start != -1 and end != -1 and end >= start:
-            return json.loads(out[start : end + 1])
-        return json.loads(out)
-    except Exception:
-        return {"raw": out}
+async def list_event_keys(r: "redis.Redis", prefix: str) -> List[str]:
+    return await scan_keys(r, f"{prefix}:events:*")
 
 
-def stream_len(compose_file: str, key: str) -> int:
-    out = run_redis_cli(compose_file, ["XLEN", key])
+def _decode_session(raw: Optional[str]) -> Dict:
+    if raw is None:
+        return {}
     try:
-        # Use the last numeric token
-        tokens = [t for t in out.split() if t.isdigit()]
-        return int(tokens[-1]) if tokens else int(out)
+        return json_loads(raw)
     except Exception:
-        return 0
+        return {"raw": raw}
 
 
-def stream_tail(compose_file: str, key: str, count: int) -> List[str]:
-    out = run_redis_cli(compose_file, ["XREVRANGE", key, "+", "-", "COUNT", str(count)])
-    return [line for line in out.splitlines() if line]
+def _format_entry(entry: Tuple[str, Dict[str, Any]]) -> str:
+    stream_id, fields = entry
+    return f"{stream_id} {fields}"
 
 
-def clear_session(compose_file: str, prefix: str, session_id: str) -> None:
-    run_redis_cli(compose_file, ["DEL", f"{prefix}:session:{session_id}", f"{prefix}:events:{session_id}"])
+def _render_row(
+    out: List[str], idx: int, sid: str, status: str, length: int, entries: List[Tuple[str, Dict[str, Any]]]
+) -> None:
+    out.append(f"  [{idx:02d}] {sid}  status={status:<12}  events={length}")
+    for entry in entries[::-1]:
+        out.append(f"      - {_format_entry(entry)}")
 
 
-def clear_all(compose_file: str, prefix: str) -> None:
-    keys = run_redis_cli(compose_file, ["KEYS", f"{prefix}:*"])
-    ks = [k for k in keys.splitlines() if k and k.startswith(f"{prefix}:")]
-    if ks:
-        run_redis_cli(compose_file, ["DEL", *ks])
+async def clear_session(r: "redis.Redis", prefix: str, session_id: str) -> None:
+    # Same keys as RedisStorage.delete_session: the session, its event stream and the event id index
+    await r.delete(f"{prefix}:session:{session_id}", f"{prefix}:events:{session_id}", f"{prefix}:eventidx:{session_id}")
 
 
-def monitor(compose_file: str, prefix: str, interval: float, tail: int) -> None:
+async def clear_all(r: "redis.Redis", prefix: str, batch_size: int = 500) -> None:
+    # SCAN + UNLINK in bounded batches: non-blocking on the server, no huge argument lists
+    batch: List[str] = []
+    async for key in r.scan_iter(match=f"{prefix}:*", count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            await r.unlink(*batch)
+            batch.clear()
+    if batch:
+        await r.unlink(*batch)
+
+
+async def monitor(r: "redis.Redis", prefix: str, interval: float, tail: int) -> None:
+    # One output buffer reused across polls and flushed with a single print per cycle
+    out: List[str] = []
     while True:
-        print(f"\n[{_now()}] Redis monitor prefix='{prefix}' (compose={compose_file})")
-        s_keys = list_session_keys(compose_file, prefix)
-        e_keys = list_event_keys(compose_file, prefix)
+        out.clear()
+        out.append(f"\n[{_now()}] Redis monitor prefix='{prefix}'")
+        s_keys = sorted(await list_session_keys(r, prefix))
+        e_keys = sorted(await list_event_keys(r, prefix))
         if not s_keys and not e_keys:
-            print("  No sessions or event streams found.")
-        idx = 1
-        # Show sessions first
-        for skey in sorted(s_keys):
-            sid = skey.split(":")[-1]
-            sess = get_session_json(compose_file, skey)
-            status = str(sess.get("status", "UNKNOWN"))
-            ev_key = f"{prefix}:events:{sid}"
-            length = stream_len(compose_file, ev_key)
-            print(f"  [{idx:02d}] {sid}  status={status:<12}  events={length}")
-            if tail > 0 and length > 0:
-                entries = stream_tail(compose_file, ev_key, tail)
-                for line in entries[::-1]:
-                    print(f"      - {line}")
-            idx += 1
-        # If there are event streams without session entries, show them too
-        for ekey in sorted(e_keys):
+            out.append("  No sessions or event streams found.")
+
+        # Queue every probe on one non-transactional pipeline: a single round-trip per poll
+        s_key_set = set(s_keys)
+        rows: List[Tuple[str, Optional[str]]] = []  # (session id, session key or None for orphan streams)
+        for skey in s_keys:
+            rows.append((skey.split(":")[-1], skey))
+        for ekey in e_keys:
             sid = ekey.split(":")[-1]
-            skey = f"{prefix}:session:{sid}"
-            if skey in s_keys:
-                continue
-            length = stream_len(compose_file, ekey)
-            print(f"  [{idx:02d}] {sid}  status={'UNKNOWN':<12}  events={length}")
-            if tail > 0 and length > 0:
-                entries = stream_tail(compose_file, ekey, tail)
-                for line in entries[::-1]:
-                    print(f"      - {line}")
-            idx += 1
-        try:
-            time.sleep(interval)
-        except KeyboardInterrupt:
-            break
+            if f"{prefix}:session:{sid}" not in s_key_set:
+                rows.append((sid, None))
+
+        pipe = r.pipeline(transaction=False)
+        for sid, skey in rows:
+            ev_key = f"{prefix}:events:{sid}"
+            if skey is not None:
+                pipe.get(skey)
+            pipe.xlen(ev_key)
+            if tail > 0:
+                pipe.xrevrange(ev_key, "+", "-", count=tail)
+        results = iter(await pipe.execute() if rows else [])
+
+        for idx, (sid, skey) in enumerate(rows, start=1):
+            status = "UNKNOWN"
+            if skey is not None:
+                status = str(_decode_session(next(results)).get("status", "UNKNOWN"))
+            length = int(next(results))
+            entries = list(next(results)) if tail > 0 else []
+            _render_row(out, idx, sid, status, length, entries)
+        print("\n".join(out), flush=True)
+        await asyncio.sleep(interval)
+
+
+async def run(redis_url: str, prefix: str, interval: float, tail: int, clear: Optional[str]) -> None:
+    r = connect(redis_url)
+    try:
+        if clear:
+            if clear == "all":
+                await clear_all(r, prefix)
+                print("Cleared all keys with prefix:", prefix)
+                return
+            await clear_session(r, prefix, clear)
+            print("Cleared:", clear)
+            return
+        await monitor(r, prefix, interval, tail)
+    finally:
+        await r.aclose()
 
 
 @click.command()
-@click.option("--compose-file", default=docker_compose_file_default(), help="Path to docker-compose.yml for Redis")
+@click.option("--redis-url", default="redis://localhost:6379/0", help="Redis URL (see examples/docker-compose.yml)")
 @click.option("--prefix", default="mcp", help="Key prefix used by storage")
 @click.option("--interval", default=2.0, type=float, help="Polling interval seconds")
 @click.option("--tail", default=5, type=int, help="Tail N recent events per session")
 @click.option("--clear", default=None, help="Clear a session by ID, or 'all' to clear all keys with prefix")
-def main(compose_file: str, prefix: str, interval: float, tail: int, clear: Optional[str]) -> None:
-    if clear:
-        if clear == "all":
-            clear_all(compose_file, prefix)
-            print("Cleared all keys with prefix:", prefix)
-            return
-        clear_session(compose_file, prefix, clear)
-        print("Cleared:", clear)
-        return
-    monitor(compose_file, prefix, interval, tail)
+def main(redis_url: str, prefix: str, interval: float, tail: int, clear: Optional[str]) -> None:
+    try:
+        asyncio.run(run(redis_url, prefix, interval, tail, clear))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
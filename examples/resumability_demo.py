@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from typing import AsyncIterator
 
 import anyio
@@ -19,18 +18,22 @@ event_store = InMemoryEventStore()
 STREAM_ID = "demo-stream"
 
 
+def _sse_frame(event_id: str, data: bytes) -> bytes:
+    return b"id: %s\ndata: %s\n\n" % (event_id.encode(), data)
+
+
 async def sse(request):
     last_event_id = request.headers.get("Last-Event-ID")
 
-    async def event_publisher() -> AsyncIterator[str]:
+    async def event_publisher() -> AsyncIterator[bytes]:
         # 1) If resuming, replay events that occurred after last_event_id on the SAME stream
         if last_event_id:
-            send, recv = anyio.create_memory_object_stream[str](50)
+            send, recv = anyio.create_memory_object_stream[bytes](50)
 
             async def _enqueue(ev):
                 try:
-                    data = json.dumps(ev.message.model_dump(by_alias=True))
-                    await send.send(f"id: {ev.event_id}\ndata: {data}\n\n")
+                    data = ev.message.model_dump_json(by_alias=True).encode()
+                    await send.send(_sse_frame(ev.event_id, data))
                 except Exception:
                     # Skip events that fail to serialize
                     pass
@@ -43,12 +46,16 @@ async def sse(request):
                     yield item
 
         # 2) After replay, keep streaming live events pushed by /publish
-        live_send, live_recv = anyio.create_memory_object_stream[str](100)
-        request.app.state.live_sse_send = live_send
-
-        async with live_recv:
-            async for item in live_recv:
-                yield item
+        subscribers = request.app.state.subscribers
+        live_send, live_recv = anyio.create_memory_object_stream[bytes](100)
+        subscribers.add(live_send)
+        try:
+            async with live_recv:
+                async for item in live_recv:
+                    yield item
+        finally:
+            subscribers.discard(live_send)
+            await live_send.aclose()
 
     return StreamingResponse(
         event_publisher(),
@@ -59,19 +66,25 @@ async def sse(request):
 
 async def publish(request):
     # Accept JSON-RPC messages; store as events on STREAM_ID with a unique event id
-    payload = await request.json()
-    message = JSONRPCMessage.model_validate(payload)
+    raw = await request.body()
+    # Validate straight from bytes (pydantic's native JSON parser), skipping the dict round-trip
+    message = JSONRPCMessage.model_validate_json(raw)
     eid = await event_store.store_event(STREAM_ID, message)
 
-    # Broadcast to any connected SSE client(s)
-    live_send = getattr(request.app.state, "live_sse_send", None)
-    if live_send is not None:
-        try:
-            data = json.dumps(message.model_dump(by_alias=True))
-            await live_send.send(f"id: {eid}\ndata: {data}\n\n")
-        except Exception:
-            # Connection might be closed, ignore
-            pass
+    # Fan out to every connected SSE client, reusing the request bytes when they fit on one data: line
+    subscribers = request.app.state.subscribers
+    if subscribers:
+        if b"\n" in raw or b"\r" in raw:
+            data = message.model_dump_json(by_alias=True, exclude_none=True).encode()
+        else:
+            data = raw.strip()
+        frame = _sse_frame(eid, data)
+        for live_send in list(subscribers):
+            try:
+                await live_send.send(frame)
+            except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+                # Subscriber went away between iterations
+                subscribers.discard(live_send)
 
     return JSONResponse({"stored_event_id": eid})
 
@@ -89,6 +102,8 @@ app = Starlette(
         Route("/publish", publish, methods=["POST"]),
     ]
 )
+# One send stream per connected /sse client; /publish fans out to all of them
+app.state.subscribers = set()
 
 
 if __name__ == "__main__":
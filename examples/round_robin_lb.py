@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
-from typing import AsyncIterator
+from collections.abc import AsyncIterator
 
-import anyio
 import click
 import httpx
+import uvicorn
 from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import StreamingResponse
@@ -15,24 +16,21 @@ from starlette.routing import Route
 
 logger = logging.getLogger(__name__)
 
-
-class RoundRobin:
-    def __init__(self, backends: list[str]) -> None:
-        if len(backends) < 2:
-            raise ValueError("Provide at least two backends")
-        self._backends = backends
-        self._index = 0
-        self._lock = anyio.Lock()
-
-    async def next(self) -> str:
-        async with self._lock:
-            url = self._backends[self._index]
-            self._index = (self._index + 1) % len(self._backends)
-            return url
-
-
-def _filtered_response_headers(upstream: httpx.Response) -> dict[str, str]:
-    hop_by_hop = {
+HOP_BY_HOP_REQ = frozenset(
+    {
+        b"connection",
+        b"proxy-connection",
+        b"keep-alive",
+        b"transfer-encoding",
+        b"te",
+        b"trailer",
+        b"upgrade",
+        b"host",
+        b"content-length",
+    }
+)
+HOP_BY_HOP_RESP = frozenset(
+    {
         "connection",
         "transfer-encoding",
         "keep-alive",
@@ -44,48 +42,56 @@ def _filtered_response_headers(upstream: httpx.Response) -> dict[str, str]:
         # Content-Length will be managed by Starlette when needed
         "content-length",
     }
-    headers: dict[str, str] = {}
-    for k, v in upstream.headers.items():
-        if k.lower() in hop_by_hop:
-            continue
-        headers[k] = v
-    return headers
+)
+DEFAULT_ACCEPT = (b"accept", b"application/json, text/event-stream")
+DEFAULT_CONTENT_TYPE = (b"content-type", b"application/json")
+
+
+class RoundRobin:
+    def __init__(self, backends: list[str]) -> None:
+        if len(backends) < 2:
+            raise ValueError("Provide at least two backends")
+        self._backends = tuple(backends)
+        # The event loop is single-threaded, so a plain iterator needs no lock
+        self._iter = itertools.cycle(self._backends)
+
+    def next(self) -> str:
+        return next(self._iter)
+
+
+def _filtered_response_headers(upstream: httpx.Response) -> dict[str, str]:
+    # httpx already yields lower-cased header names, so a frozenset lookup per header suffices
+    return {k: v for k, v in upstream.headers.items() if k not in HOP_BY_HOP_RESP}
 
 
 async def proxy_handler(request: Request) -> StreamingResponse:
     rr: RoundRobin = request.app.state.rr  # type: ignore[attr-defined]
     client: httpx.AsyncClient = request.app.state.client  # type: ignore[attr-defined]
 
-    backend_base = await rr.next()
+    backend_base = rr.next()
     upstream_url = f"{backend_base}{request.url.path}"
     if request.url.query:
         upstream_url += f"?{request.url.query}"
 
-    # Build sanitized headers for upstream (preserve MCP headers, drop hop-by-hop)
-    incoming = dict(request.headers)
-    hop_by_hop_req = {
-        "connection",
-        "proxy-connection",
-        "keep-alive",
-        "transfer-encoding",
-        "te",
-        "trailer",
-        "upgrade",
-        "host",
-        "content-length",
-    }
-    headers: dict[str, str] = {}
-    for k, v in incoming.items():
-        if k.lower() in hop_by_hop_req:
+    # Build sanitized headers for upstream (preserve MCP headers, drop hop-by-hop).
+    # ASGI header names are already lower-case bytes, so a single pass suffices.
+    headers: list[tuple[bytes, bytes]] = []
+    has_accept = has_content_type = False
+    for k, v in request.headers.raw:
+        if k in HOP_BY_HOP_REQ:
             continue
-        headers[k] = v
+        if k == b"accept":
+            has_accept = True
+        elif k == b"content-type":
+            has_content_type = True
+        headers.append((k, v))
     # Ensure required MCP headers are present
-    if "accept" not in {k.lower() for k in headers.keys()}:
-        headers["Accept"] = "application/json, text/event-stream"
+    if not has_accept:
+        headers.append(DEFAULT_ACCEPT)
     # If we have a JSON body and no content-type, set it
     # (httpx will also set this when using 'content' bytes, but we make it explicit)
-    if "content-type" not in {k.lower() for k in headers.keys()}:
-        headers["Content-Type"] = "application/json"
+    if not has_content_type:
+        headers.append(DEFAULT_CONTENT_TYPE)
 
     body = await request.body()
     # Pass raw bytes; if empty but method expects JSON, forward as-is
@@ -102,10 +108,11 @@ async def proxy_handler(request: Request) -> StreamingResponse:
     status = upstream.status_code
 
     async def aiter() -> AsyncIterator[bytes]:
+        # Forward chunks exactly as the transport yields them; the finally closes upstream
+        # even when the client disconnects or the stream fails mid-way
         try:
             async for chunk in upstream.aiter_raw():
-                if chunk:
-                    yield chunk
+                yield chunk
         finally:
             await upstream.aclose()
 
@@ -130,7 +137,8 @@ def main(listen_port: int, backend: list[str], log_level: str) -> int:
     rr = RoundRobin(list(backend))
 
     async def lifespan(app: Starlette):
-        async with httpx.AsyncClient(timeout=None) as client:
+        limits = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+        async with httpx.AsyncClient(timeout=None, limits=limits) as client:
             app.state.rr = rr
             app.state.client = client
             yield
@@ -140,8 +148,6 @@ def main(listen_port: int, backend: list[str], log_level: str) -> int:
         lifespan=lifespan,
     )
 
-    import uvicorn
-
     uvicorn.run(app, host="127.0.0.1", port=listen_port)
     return 0
 
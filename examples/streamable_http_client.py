@@ -1,46 +1,90 @@
 #!/usr/bin/env python3
 
 import asyncio
-import json
-from typing import Any, Tuple
+import re
+from typing import AsyncIterator, Tuple
 
 import click
 import httpx
 
+DEFAULT_HEADERS = {
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+    "MCP-Protocol-Version": "2025-06-18",
+}
+# All requests of a run share one pooled client so they reuse the keep-alive connection
+CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30.0)
+
+
+# SSE events end at a blank line; each event may carry several `data:` lines
+_SSE_EVENT_END = re.compile(rb"\r?\n\r?\n")
+_SSE_DATA_LINE = re.compile(rb"^data: ?(.*?)\r?$", re.MULTILINE)
+
+
+def _sse_event_data(frame: bytes) -> bytes:
+    return b"\n".join(m.group(1) for m in _SSE_DATA_LINE.finditer(frame)).strip()
+
+
+async def iter_sse_data(r: httpx.Response, buf: bytearray | None = None) -> AsyncIterator[bytes]:
+    """Yield the joined `data:` payload of each complete SSE event, scanning raw bytes.
+
+    Multi-line `data:` fields are joined with newlines as the SSE spec requires;
+    `event:`/`id:`/comment lines are skipped without being decoded. Pass `buf` to
+    reuse one scratch buffer across requests.
+    """
+    if buf is None:
+        buf = bytearray()
+    else:
+        buf.clear()
+    async for chunk in r.aiter_bytes():
+        # Resume the terminator search just before the new bytes (a terminator is at most 4 bytes)
+        # so a large event arriving in many chunks is scanned once, not once per chunk.
+        scan = max(len(buf) - 3, 0)
+        buf += chunk
+        start = 0
+        while (m := _SSE_EVENT_END.search(buf, scan)) is not None:
+            data = _sse_event_data(buf[start : m.start()])
+            if data:
+                yield data
+            start = scan = m.end()
+        del buf[:start]
+    if buf:
+        data = _sse_event_data(bytes(buf))
+        if data:
+            yield data
+
 
 async def shttp_post(
-    client: httpx.AsyncClient, url: str, payload: dict, *, headers: dict | None = None
-) -> Tuple[str | None, Any | None]:
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict,
+    *,
+    headers: dict | None = None,
+    buf: bytearray | None = None,
+) -> Tuple[str | None, bytes | None]:
     async with client.stream("POST", url, json=payload, headers=headers) as r:
         r.raise_for_status()
         sid = r.headers.get("Mcp-Session-Id") or r.headers.get("mcp-session-id")
-        event_obj = None
-        async for line in r.aiter_lines():
-            if not line:
-                continue
-            if line.startswith("data:"):
-                data = line[5:].strip()
-                if not data:
-                    continue
-                try:
-                    event_obj = json.loads(data)
-                except Exception:
-                    continue
-                break
-        return sid, event_obj
+        # Hand back the first event's raw payload; callers decode only if they need an object
+        event_data = None
+        async for data in iter_sse_data(r, buf):
+            event_data = data
+            break
+        return sid, event_data
+
+
+def _text(payload: bytes | None) -> str | None:
+    return payload.decode("utf-8", errors="replace") if payload is not None else None
 
 
 @click.command()
 @click.option("--base", default="http://127.0.0.1:3000/mcp/", help="Base URL of MCP endpoint (must end with /)")
 @click.option("--shttp/--no-shttp", default=True, help="Use Streamable HTTP (SSE on POST). If disabled, expect JSON.")
 async def main(base: str, shttp: bool) -> None:
-    default_headers = {
-        "Accept": "application/json, text/event-stream",
-        "Content-Type": "application/json",
-        "MCP-Protocol-Version": "2025-06-18",
-    }
-
-    async with httpx.AsyncClient(timeout=20.0, follow_redirects=True, headers=default_headers) as client:
+    async with httpx.AsyncClient(
+        timeout=20.0, follow_redirects=True, limits=CLIENT_LIMITS, headers=DEFAULT_HEADERS
+    ) as client:
+        sse_buf = bytearray()  # scratch buffer reused by every shttp_post call
         # Initialize
         init = {
             "jsonrpc": "2.0",
@@ -53,8 +97,8 @@ async def main(base: str, shttp: bool) -> None:
             },
         }
         if shttp:
-            sid, ev = await shttp_post(client, base, init)
-            print("initialize (shttp):", ev)
+            sid, ev = await shttp_post(client, base, init, buf=sse_buf)
+            print("initialize (shttp):", _text(ev))
         else:
             r = await client.post(base, json=init)
             r.raise_for_status()
@@ -66,21 +110,21 @@ async def main(base: str, shttp: bool) -> None:
         # Send Initialized notification
         initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
         if shttp:
-            _, ev = await shttp_post(client, base, initialized, headers=headers)
+            _, ev = await shttp_post(client, base, initialized, headers=headers, buf=sse_buf)
             if ev is not None:
-                print("initialized (shttp):", ev)
+                print("initialized (shttp):", _text(ev))
         else:
-            r_initd = await client.post(base, json=initialized, headers={**default_headers, **headers})
+            r_initd = await client.post(base, json=initialized, headers=headers)
             if r_initd.status_code not in (200, 202):
                 print("initialized status:", r_initd.status_code, r_initd.text)
 
         # tools/list
         list_req = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
         if shttp:
-            _, ev = await shttp_post(client, base, list_req, headers=headers)
-            print("tools/list (shttp):", ev)
+            _, ev = await shttp_post(client, base, list_req, headers=headers, buf=sse_buf)
+            print("tools/list (shttp):", _text(ev))
         else:
-            r2 = await client.post(base, json=list_req, headers={**default_headers, **headers})
+            r2 = await client.post(base, json=list_req, headers=headers)
             print("tools/list:", r2.json())
 
         # tools/call
@@ -97,12 +141,6 @@ async def main(base: str, shttp: bool) -> None:
                 },
             },
         }
-        if shttp:
-            _, ev = await shttp_post(client, base, call, headers=headers)
-            print("tools/call (shttp):", ev)
-        else:
-            r3 = await client.post(base, json=call, headers={**default_headers, **headers})
-            print("tools/call:", r3.json())
 
         # Optional: trigger GET-stream broadcast
         call_get_stream = {
@@ -114,15 +152,26 @@ async def main(base: str, shttp: bool) -> None:
                 "arguments": {"interval": 0.25, "count": 3, "text": "hello"},
             },
         }
+        # The two tool calls are independent once the session is ACTIVE, so run them concurrently.
+        # initialize -> notifications/initialized -> tools/list above must stay ordered: the server
+        # rejects requests until initialization has completed.
         if shttp:
-            _, ev2 = await shttp_post(client, base, call_get_stream, headers=headers)
-            print("tools/call GET-broadcast (shttp):", ev2)
+            # Concurrent calls each get their own scratch buffer
+            (_, ev), (_, ev2) = await asyncio.gather(
+                shttp_post(client, base, call, headers=headers),
+                shttp_post(client, base, call_get_stream, headers=headers),
+            )
+            print("tools/call (shttp):", _text(ev))
+            print("tools/call GET-broadcast (shttp):", _text(ev2))
         else:
-            r4 = await client.post(base, json=call_get_stream, headers={**default_headers, **headers})
+            r3, r4 = await asyncio.gather(
+                client.post(base, json=call, headers=headers),
+                client.post(base, json=call_get_stream, headers=headers),
+            )
+            print("tools/call:", r3.json())
             print("tools/call GET-broadcast:", r4.json())
 
 
 if __name__ == "__main__":
     # click supports asyncio entrypoints via 'python -m' invocation in uv
     asyncio.run(main(standalone_mode=False))
-
@@ -2,28 +2,121 @@
 
 import contextlib
 import logging
-from collections.abc import AsyncIterator
+import sys
+import typing as t
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 
 import anyio
 import click
 import mcp.types as types
+import uvicorn
+from anyio.streams.memory import MemoryObjectReceiveStream
 from mcp.server.lowlevel import Server
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from pydantic import AnyUrl
 from starlette.applications import Starlette
 from starlette.routing import Mount
-from starlette.types import Receive, Scope, Send
 
+from mcp_db.cache.local_cache import LocalCache
 from mcp_db.core.admission import StreamableHTTPAdmissionController
 from mcp_db.core.asgi_wrapper import ASGITransportWrapper
-from mcp_db.event.inmemory import InMemoryEventStore
-from mcp_db.event.redis import RedisEventStore
 from mcp_db.core.interceptor import ProtocolInterceptor
+from mcp_db.core.models import MCPSession
 from mcp_db.core.session_manager import SessionManager
+from mcp_db.event.inmemory import InMemoryEventStore
+from mcp_db.event.redis import RedisEventStore
 from mcp_db.session.redis_adapter import RedisStorage
+from mcp_db.utils.eventloop import preferred_loop
 
 logger = logging.getLogger(__name__)
 
+# Static tool list, built once at import rather than on every tools/list request
+_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="start-notification-stream",
+        description=("Sends a stream of notifications with configurable count and interval"),
+        inputSchema={
+            "type": "object",
+            "required": ["interval", "count", "caller"],
+            "properties": {
+                "interval": {
+                    "type": "number",
+                    "description": "Interval between notifications in seconds",
+                },
+                "count": {
+                    "type": "number",
+                    "description": "Number of notifications to send",
+                },
+                "caller": {
+                    "type": "string",
+                    "description": ("Identifier of the caller to include in notifications"),
+                },
+            },
+        },
+    ),
+    types.Tool(
+        name="start-get-stream-broadcast",
+        description=("Emits notifications on the GET SSE stream (not tied to a request) to demo Last-Event-ID replay"),
+        inputSchema={
+            "type": "object",
+            "required": ["interval", "count", "text"],
+            "properties": {
+                "interval": {"type": "number", "description": "Interval between notifications in seconds"},
+                "count": {"type": "number", "description": "Number of notifications to send"},
+                "text": {"type": "string", "description": "Message base text"},
+            },
+        },
+    ),
+]
+
+
+# Optional: compile each tool's inputSchema once (fastjsonschema, from the `speedups` extra) and
+# validate in call_tool, instead of the SDK re-walking the schema with jsonschema on every call.
+try:
+    import fastjsonschema
+except ImportError:  # pragma: no cover - optional dependency
+    fastjsonschema = None
+
+_VALIDATORS: dict[str, Callable[[dict], t.Any]] | None = (
+    None if fastjsonschema is None else {tool.name: fastjsonschema.compile(tool.inputSchema) for tool in _TOOLS}
+)
+
+
+def _validate_arguments(name: str, arguments: dict) -> None:
+    validate = _VALIDATORS.get(name) if _VALIDATORS is not None else None
+    if validate is None:
+        return
+    try:
+        validate(arguments)
+    except fastjsonschema.JsonSchemaException as e:
+        # Surfaces as an isError tool result, matching the SDK's own validation message
+        raise ValueError(f"Input validation error: {e.message}") from e
+
+
+async def _drain_paced(
+    recv: MemoryObjectReceiveStream[str], interval: float, emit: Callable[[str], Awaitable[None]]
+) -> None:
+    # Single drain task: sleep only the remaining delta to each deadline, so slow sends don't add drift
+    async with recv:
+        deadline = anyio.current_time()
+        async for msg in recv:
+            delay = deadline - anyio.current_time()
+            if delay > 0:
+                await anyio.sleep(delay)
+            await emit(msg)
+            deadline += interval
+
+
+async def _send_paced(
+    messages: Iterable[str], count: int, interval: float, emit: Callable[[str], Awaitable[None]]
+) -> None:
+    send, recv = anyio.create_memory_object_stream[str](max_buffer_size=count)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(_drain_paced, recv, interval, emit)
+        async with send:
+            for msg in messages:
+                send.send_nowait(msg)
+
 
 @click.command()
 @click.option("--port", default=3000, help="Port to listen on for HTTP")
@@ -56,36 +149,39 @@ def main(port: int, log_level: str, json_response: bool, event_store: str, redis
 
     app = Server("mcp-streamable-http-with-db")
 
-    @app.call_tool()
+    @app.call_tool(validate_input=_VALIDATORS is None)
     async def call_tool(name: str, arguments: dict) -> list[types.ContentBlock]:
+        _validate_arguments(name, arguments)
         interval = arguments.get("interval", 1.0)
         count = arguments.get("count", 3)
         caller = arguments.get("caller", "unknown")
+        ctx = app.request_context
 
-        for i in range(count):
-            notification_msg = f"[{i + 1}/{count}] Event from '{caller}' - Use Last-Event-ID to resume if disconnected"
-            await app.request_context.session.send_log_message(
+        async def emit_notification(msg: str) -> None:
+            await ctx.session.send_log_message(
                 level="info",
-                data=notification_msg,
+                data=msg,
                 logger="notification_stream",
-                related_request_id=app.request_context.request_id,
+                related_request_id=ctx.request_id,
             )
-            if i < count - 1:
-                await anyio.sleep(interval)
 
-        await app.request_context.session.send_resource_updated(uri=AnyUrl("http:///test_resource"))
+        msgs = [
+            f"[{i + 1}/{count}] Event from '{caller}' - Use Last-Event-ID to resume if disconnected"
+            for i in range(count)
+        ]
+        await _send_paced(msgs, count, interval, emit_notification)
+
+        await ctx.session.send_resource_updated(uri=AnyUrl("http:///test_resource"))
 
         # Optional: broadcast on GET stream for resumability demo
         if name == "start-get-stream-broadcast":
             text = arguments.get("text", "demo")
-            for i in range(count):
-                await app.request_context.session.send_log_message(
-                    level="info",
-                    data=f"[GET stream] {text} #{i + 1}",
-                    logger="get_stream",
-                )
-                if i < count - 1:
-                    await anyio.sleep(interval)
+
+            async def emit_broadcast(msg: str) -> None:
+                await ctx.session.send_log_message(level="info", data=msg, logger="get_stream")
+
+            msgs = [f"[GET stream] {text} #{i + 1}" for i in range(count)]
+            await _send_paced(msgs, count, interval, emit_broadcast)
 
         return [
             types.TextContent(
@@ -96,45 +192,7 @@ def main(port: int, log_level: str, json_response: bool, event_store: str, redis
 
     @app.list_tools()
     async def list_tools() -> list[types.Tool]:
-        return [
-            types.Tool(
-                name="start-notification-stream",
-                description=("Sends a stream of notifications with configurable count and interval"),
-                inputSchema={
-                    "type": "object",
-                    "required": ["interval", "count", "caller"],
-                    "properties": {
-                        "interval": {
-                            "type": "number",
-                            "description": "Interval between notifications in seconds",
-                        },
-                        "count": {
-                            "type": "number",
-                            "description": "Number of notifications to send",
-                        },
-                        "caller": {
-                            "type": "string",
-                            "description": ("Identifier of the caller to include in notifications"),
-                        },
-                    },
-                },
-            ),
-            types.Tool(
-                name="start-get-stream-broadcast",
-                description=(
-                    "Emits notifications on the GET SSE stream (not tied to a request) to demo Last-Event-ID replay"
-                ),
-                inputSchema={
-                    "type": "object",
-                    "required": ["interval", "count", "text"],
-                    "properties": {
-                        "interval": {"type": "number", "description": "Interval between notifications in seconds"},
-                        "count": {"type": "number", "description": "Number of notifications to send"},
-                        "text": {"type": "string", "description": "Message base text"},
-                    },
-                },
-            ),
-        ]
+        return _TOOLS
 
     # Streamable HTTP session manager from MCP SDK
     selected_event_store = (
@@ -144,12 +202,9 @@ def main(port: int, log_level: str, json_response: bool, event_store: str, redis
         app=app, event_store=selected_event_store, json_response=json_response
     )
 
-    async def handle_streamable_http(scope: Scope, receive: Receive, send: Send) -> None:
-        await session_manager.handle_request(scope, receive, send)
-
     @contextlib.asynccontextmanager
     async def lifespan(starlette_app: Starlette) -> AsyncIterator[None]:
-        async with session_manager.run():
+        async with session_manager.run(), admission.run():
             logger.info("Application started with StreamableHTTP session manager!")
             try:
                 yield
@@ -158,34 +213,29 @@ def main(port: int, log_level: str, json_response: bool, event_store: str, redis
 
     # mcp-db storage wrapper components (transport-level only; handlers remain unaware)
     storage = RedisStorage(url="redis://localhost:6379/0", prefix="mcp")
-    db_sessions = SessionManager(storage=storage, event_store=None)
+    # L1 cache in front of Redis: hot sessions skip the round-trip on every admission lookup.
+    # A short TTL bounds how stale a status written by another node can be.
+    db_sessions = SessionManager(
+        storage=storage,
+        event_store=None,
+        use_local_cache=True,
+        local_cache=LocalCache(max_size=10_000, ttl_seconds=5.0, touch_on_get=False),
+    )
     interceptor = ProtocolInterceptor(db_sessions)
 
     # Admission controller for the SDK manager
     admission = StreamableHTTPAdmissionController(manager=session_manager, app=app)
 
     # Helper to let wrapper consult storage without importing adapters
-    async def lookup_session(session_id: str):
-        sess = await db_sessions.get(session_id)
-        return (
-            None
-            if sess is None
-            else {
-                "id": sess.id,
-                "status": getattr(sess.status, "value", str(sess.status)),
-                "client_id": sess.client_id,
-                "server_id": sess.server_id,
-                "capabilities": sess.capabilities,
-                "metadata": sess.metadata,
-            }
-        )
+    async def lookup_session(session_id: str) -> MCPSession | None:
+        return await db_sessions.get(sys.intern(session_id))
 
     # Wrap the ASGI transport for the mounted MCP endpoint
     wrapped_mcp_asgi = ASGITransportWrapper(
         interceptor,
         admission_controller=admission,
         session_lookup=lookup_session,
-    ).wrap(handle_streamable_http)
+    ).wrap(session_manager.handle_request)
 
     starlette_app = Starlette(
         debug=True,
@@ -193,9 +243,12 @@ def main(port: int, log_level: str, json_response: bool, event_store: str, redis
         lifespan=lifespan,
     )
 
-    import uvicorn
+    # uvloop (libuv) is noticeably faster for SSE-heavy traffic; it is optional and unavailable on Windows
+    loop = preferred_loop()
+    logger.info("Starting uvicorn with %s event loop", loop)
 
-    uvicorn.run(starlette_app, host="127.0.0.1", port=port)
+    config = uvicorn.Config(starlette_app, host="127.0.0.1", port=port, loop=loop, http="auto", lifespan="on")
+    uvicorn.Server(config).run()
     return 0
 
 
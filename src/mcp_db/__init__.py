@@ -4,34 +4,64 @@ A standalone storage wrapper for MCP servers providing session persistence,
 event sourcing, caching, and resilience utilities.
 
 This package is self-contained and does not import non-stdlib dependencies.
+Public names are resolved lazily (PEP 562), so `import mcp_db` does not pull in
+the SDK, redis, or pydantic until an attribute that needs them is accessed.
 """
 
-from .core.admission import (
-    StreamableHTTPAdmissionController,
-    TransportAdmissionController,
-)
-from .core.asgi_wrapper import ASGITransportWrapper
-from .core.interceptor import ProtocolInterceptor
-from .core.models import (
-    MCPEvent,
-    MCPSession,
-    SessionStatus,
-)
-from .core.session_manager import SessionManager
-from .core.wrapper import MCPStorageWrapper
-from .event import (
-    EventCallback,
-    EventId,
-    EventMessage,
-    EventStore,
-    InMemoryEventStore,
-    RedisEventStore,
-    StreamId,
-)
-from .session import (
-    InMemoryStorage,
-    StorageAdapter,
-)
+from __future__ import annotations
+
+import importlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .core.admission import (
+        StreamableHTTPAdmissionController,
+        TransportAdmissionController,
+    )
+    from .core.asgi_wrapper import ASGITransportWrapper
+    from .core.interceptor import ProtocolInterceptor
+    from .core.models import (
+        MCPEvent,
+        MCPSession,
+        SessionStatus,
+    )
+    from .core.session_manager import SessionManager
+    from .core.wrapper import MCPStorageWrapper
+    from .event import (
+        EventCallback,
+        EventId,
+        EventMessage,
+        EventStore,
+        InMemoryEventStore,
+        RedisEventStore,
+        StreamId,
+    )
+    from .session import (
+        InMemoryStorage,
+        StorageAdapter,
+    )
+
+# public name -> (module, attribute)
+_LAZY: dict[str, tuple[str, str]] = {
+    "StreamableHTTPAdmissionController": ("mcp_db.core.admission", "StreamableHTTPAdmissionController"),
+    "TransportAdmissionController": ("mcp_db.core.admission", "TransportAdmissionController"),
+    "ASGITransportWrapper": ("mcp_db.core.asgi_wrapper", "ASGITransportWrapper"),
+    "ProtocolInterceptor": ("mcp_db.core.interceptor", "ProtocolInterceptor"),
+    "MCPEvent": ("mcp_db.core.models", "MCPEvent"),
+    "MCPSession": ("mcp_db.core.models", "MCPSession"),
+    "SessionStatus": ("mcp_db.core.models", "SessionStatus"),
+    "SessionManager": ("mcp_db.core.session_manager", "SessionManager"),
+    "MCPStorageWrapper": ("mcp_db.core.wrapper", "MCPStorageWrapper"),
+    "EventCallback": ("mcp_db.event.types", "EventCallback"),
+    "EventId": ("mcp_db.event.types", "EventId"),
+    "EventMessage": ("mcp_db.event.types", "EventMessage"),
+    "StreamId": ("mcp_db.event.types", "StreamId"),
+    "EventStore": ("mcp_db.event.base", "EventStore"),
+    "InMemoryEventStore": ("mcp_db.event.inmemory", "InMemoryEventStore"),
+    "RedisEventStore": ("mcp_db.event.redis", "RedisEventStore"),
+    "InMemoryStorage": ("mcp_db.session.base", "InMemoryStorage"),
+    "StorageAdapter": ("mcp_db.session.base", "StorageAdapter"),
+}
 
 __all__ = [
     "MCPStorageWrapper",
@@ -55,3 +85,18 @@ __all__ = [
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> t.Any:
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    # Cache on the module so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
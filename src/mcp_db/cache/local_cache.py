@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import heapq
+import threading
 import time
 import typing as t
 from collections import OrderedDict
@@ -10,37 +12,70 @@ class LocalCache:
 
     No external deps; suitable for small working sets.
     Provides fast in-memory caching local to each server instance.
+    Safe to share between threads (e.g. multi-threaded workers); expired
+    entries are purged lazily via an expiry heap rather than by scanning.
     """
 
-    def __init__(self, max_size: int = 1000, ttl_seconds: float = 60.0) -> None:
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = 60.0, touch_on_get: bool = True) -> None:
         self._store: "OrderedDict[str, tuple[float, t.Any]]" = OrderedDict()
         self._max_size = max_size
         self._ttl = ttl_seconds
+        # When False, hits don't reorder entries: eviction order is insertion order, with TTL doing the work
+        self._touch_on_get = touch_on_get
+        self._lock = threading.Lock()
+        # (expires_at, key) min-heap; entries may be stale after overwrite/delete
+        self._expiry_heap: list[tuple[float, str]] = []
 
     def get(self, key: str) -> t.Optional[t.Any]:
-        now = time.time()
-        item = self._store.get(key)
-        if item is None:
-            return None
-        expires_at, value = item
-        if expires_at < now:
-            self._store.pop(key, None)
-            return None
-        # mark as recently used
-        self._store.move_to_end(key)
-        return value
+        now = time.monotonic()
+        with self._lock:
+            item = self._store.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < now:
+                self._store.pop(key, None)
+                return None
+            if self._touch_on_get:
+                # mark as recently used
+                self._store.move_to_end(key)
+            return value
 
     def set(self, key: str, value: t.Any, ttl_seconds: t.Optional[float] = None) -> None:
         ttl = self._ttl if ttl_seconds is None else ttl_seconds
-        expires_at = time.time() + ttl
-        self._store[key] = (expires_at, value)
-        self._store.move_to_end(key)
-        if len(self._store) > self._max_size:
-            # evict LRU
-            self._store.popitem(last=False)
+        now = time.monotonic()
+        expires_at = now + ttl
+        with self._lock:
+            if len(self._expiry_heap) > 2 * self._max_size:
+                self._evict_expired(now)
+            self._store[key] = (expires_at, value)
+            self._store.move_to_end(key)
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            if len(self._store) > self._max_size:
+                # Prefer dropping expired entries over live ones
+                self._evict_expired(now)
+                if len(self._store) > self._max_size:
+                    # evict LRU
+                    self._store.popitem(last=False)
 
     def delete(self, key: str) -> None:
-        self._store.pop(key, None)
+        with self._lock:
+            self._store.pop(key, None)
 
     def clear(self) -> None:
-        self._store.clear()
+        with self._lock:
+            self._store.clear()
+            self._expiry_heap.clear()
+
+    def _evict_expired(self, now: float) -> None:
+        # Caller holds the lock
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            item = self._store.get(key)
+            if item is not None and item[0] == expires_at:
+                del self._store[key]
+        if len(heap) > 2 * self._max_size:
+            # Rebuild from live entries to shed heap records of overwritten/deleted keys
+            self._expiry_heap = [(expires_at, key) for key, (expires_at, _) in self._store.items()]
+            heapq.heapify(self._expiry_heap)
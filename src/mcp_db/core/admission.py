@@ -1,6 +1,49 @@
 from __future__ import annotations
 
+import contextlib
+import functools
+import inspect
+import sys
 import typing as t
+from importlib import import_module
+from importlib.util import find_spec
+
+import anyio
+
+_TRANSPORT_CLASS_CANDIDATES = (
+    "mcp.server.streamable_http_transport.StreamableHTTPServerTransport",
+    "mcp.server.streamable_http_manager.StreamableHTTPServerTransport",
+    "mcp.server.streamable_http.StreamableHTTPServerTransport",
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_transport_class() -> t.Any:
+    for path in _TRANSPORT_CLASS_CANDIDATES:
+        module_name, cls_name = path.rsplit(".", 1)
+        # Check availability without executing modules that don't exist in this SDK layout
+        try:
+            if find_spec(module_name) is None:
+                continue
+        except ModuleNotFoundError:
+            continue
+        cls = getattr(import_module(module_name), cls_name, None)
+        if cls is not None:
+            return cls
+    raise ImportError(
+        "Could not locate StreamableHTTPServerTransport in MCP SDK. Checked: " + ", ".join(_TRANSPORT_CLASS_CANDIDATES)
+    )
+
+
+def _transport_init_params(transport_cls: t.Any) -> t.Optional[frozenset[str]]:
+    """Return the keyword names accepted by `transport_cls`, or None if it takes **kwargs or can't be inspected."""
+    try:
+        params = inspect.signature(transport_cls).parameters
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        return None
+    return frozenset(params)
 
 
 class TransportAdmissionController:
@@ -31,106 +74,96 @@ class StreamableHTTPAdmissionController(TransportAdmissionController):
         self._manager = manager
         self._app = app
 
-        # Resolve transport class dynamically to survive SDK refactors
-        self._transport_cls = self._resolve_transport_class()
+        # Resolve transport class dynamically to survive SDK refactors (cached per process)
+        self._transport_cls = _resolve_transport_class()
+
+        # Capture manager state that is fixed once the manager is constructed; the
+        # transport map is a single dict the SDK mutates in place. `_task_group` is
+        # only set while the manager is running, so it is still looked up per call.
+        self._instances: t.Optional[dict] = getattr(manager, "_server_instances", None)
+        self._json_response = getattr(manager, "json_response", False)
+        self._event_store = getattr(manager, "event_store", None)
+        self._security_settings = getattr(manager, "security_settings", None)
+
+        # Probe the transport constructor once so admission doesn't guess its signature per session
+        params = _transport_init_params(self._transport_cls)
+        # Older SDKs name the JSON-response flag `json_response`
+        json_kw = (
+            "is_json_response_enabled" if params is None or "is_json_response_enabled" in params else "json_response"
+        )
+        candidates = {
+            json_kw: self._json_response,
+            "event_store": self._event_store,
+            "security_settings": self._security_settings,
+        }
+        # Controller-owned task group for transports the SDK manager can't host; see run()
+        self._bg_tg: t.Any = None
+
+        self._transport_kwargs: dict[str, t.Any] = {
+            k: v for k, v in candidates.items() if params is None or k in params
+        }
 
     def _resolve_transport_class(self) -> t.Any:
-        candidates = [
-            "mcp.server.streamable_http_transport.StreamableHTTPServerTransport",
-            "mcp.server.streamable_http_manager.StreamableHTTPServerTransport",
-            "mcp.server.streamable_http.StreamableHTTPServerTransport",
-        ]
-        for path in candidates:
+        return _resolve_transport_class()
+
+    @contextlib.asynccontextmanager
+    async def run(self) -> t.AsyncIterator[None]:
+        """Own a long-lived task group for transports started outside the SDK manager.
+
+        While active, admissions that find no manager task group start their
+        transport fire-and-forget on this group instead of returning unstarted.
+        Enter it alongside the SDK manager's `run()` in the app lifespan.
+        """
+        async with anyio.create_task_group() as tg:
+            self._bg_tg = tg
             try:
-                module_name, cls_name = path.rsplit(".", 1)
-                module = __import__(module_name, fromlist=[cls_name])
-                return getattr(module, cls_name)
-            except Exception:
-                continue
-        raise ImportError(
-            "Could not locate StreamableHTTPServerTransport in MCP SDK. Checked: " + ", ".join(candidates)
-        )
+                yield
+            finally:
+                self._bg_tg = None
+                tg.cancel_scope.cancel()
 
     def has_session(self, session_id: str) -> bool:
         # SDK manager is expected to have an internal mapping of active transports
-        instances = getattr(self._manager, "_server_instances", None)
-        try:
-            return bool(instances is not None and session_id in instances)
-        except Exception:
-            return False
+        session_id = sys.intern(session_id)
+        instances = self._instances
+        return instances is not None and session_id in instances
 
     async def ensure_session_transport(self, session_id: str) -> None:
+        # Intern so the key stored in the manager's map is shared with later lookups
+        session_id = sys.intern(session_id)
         # If already present, nothing to do
         if self.has_session(session_id):
             return
 
         # Construct a transport compatible with the manager
-        json_response = getattr(self._manager, "json_response", False)
-        event_store = getattr(self._manager, "event_store", None)
-        security_settings = getattr(self._manager, "security_settings", None)
-
-        try:
-            transport = self._transport_cls(
-                mcp_session_id=session_id,
-                is_json_response_enabled=json_response,
-                event_store=event_store,
-                security_settings=security_settings,
-            )
-        except TypeError:
-            # Older/newer SDKs may use different parameter names
-            try:
-                transport = self._transport_cls(
-                    mcp_session_id=session_id,
-                    json_response=json_response,
-                    event_store=event_store,
-                    security_settings=security_settings,
-                )
-            except Exception:
-                # As a last resort, try minimal ctor
-                transport = self._transport_cls(mcp_session_id=session_id)
+        transport = self._transport_cls(mcp_session_id=session_id, **self._transport_kwargs)
 
         # Register into manager's map
-        instances = getattr(self._manager, "_server_instances", None)
+        instances = self._instances
         if instances is not None:
             instances[session_id] = transport
 
         # Start the app runner for this transport if a task group is available.
         # This mirrors the SDK's flow for new sessions but with an existing sid.
         task_group = getattr(self._manager, "_task_group", None)
-        if task_group is None:
-            # No task group available; best-effort registration is done.
-            return
-
-        async def _run(*, task_status=None) -> None:
-            try:
-                async with transport.connect() as (read, write):
-                    # Signal that streams are ready so the manager can route requests
-                    if task_status is not None:
-                        try:
-                            import anyio
-
-                            if task_status is anyio.TASK_STATUS_IGNORED:
-                                pass
-                            else:
-                                task_status.started()
-                        except Exception:
-                            pass
-                    init_options = self._app.create_initialization_options()
-                    await self._app.run(read, write, init_options, stateless=False)
-            except Exception:
-                # Swallow exceptions to avoid crashing the node; manager will handle errors.
-                pass
-
+        if task_group is not None and hasattr(task_group, "start"):
+            # start() waits until transport.connect() is established
+            await task_group.start(self._run_transport, transport)
+        elif self._bg_tg is not None:
+            # No usable manager task group; run fire-and-forget on our own (see run())
+            self._bg_tg.start_soon(self._run_transport, transport)
+        # Otherwise registration alone is best-effort
+
+    async def _run_transport(self, transport: t.Any, *, task_status: t.Any = anyio.TASK_STATUS_IGNORED) -> None:
         try:
-            # Prefer start() to wait until transport.connect() is established
-            await task_group.start(_run)
+            async with transport.connect() as (read, write):
+                # Signal that streams are ready so the manager can route requests
+                task_status.started()
+                init_options = self._app.create_initialization_options()
+                await self._app.run(read, write, init_options, stateless=False)
+        except anyio.get_cancelled_exc_class():
+            # Let shutdown cancel the runner
+            raise
         except Exception:
-            # If the manager's task group API differs, run fire-and-forget
-            try:
-                import anyio
-
-                async with anyio.create_task_group() as tg:
-                    await tg.start(_run)
-            except Exception:
-                # Last fallback: run inline (potentially blocking)
-                await _run()
+            # Swallow exceptions to avoid crashing the node; manager will handle errors.
+            pass
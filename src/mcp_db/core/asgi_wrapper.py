@@ -1,15 +1,365 @@
 from __future__ import annotations
 
-import json
 import logging
 import typing as t
+from collections import OrderedDict
+
+import anyio
+
+from mcp_db.utils.serialization import json_dumps, json_loads_async, peek_jsonrpc_fields, peek_jsonrpc_method
 
 from .admission import TransportAdmissionController
 from .interceptor import ProtocolInterceptor
+from .models import MCPSession, SessionStatus
 
 Scope = t.Dict[str, t.Any]
 Receive = t.Callable[[], t.Awaitable[t.Dict[str, t.Any]]]
 Send = t.Callable[[t.Dict[str, t.Any]], t.Awaitable[None]]
+# Lookups may return the stored MCPSession as-is, or a mapping with at least a "status" key
+SessionRecord = t.Union[MCPSession, t.Mapping[str, t.Any]]
+SessionLookup = t.Callable[[str], t.Awaitable[t.Optional[SessionRecord]]]
+
+
+# Response handling modes, classified once per response from its content type
+_MODE_SKIP = 0
+_MODE_JSON = 1
+_MODE_SSE = 2
+
+# Internal warm-up request: constant payload and the headers it may need to add
+_WARM_MESSAGE = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+_WARM_CONTENT_TYPE = (b"content-type", b"application/json")
+_WARM_ACCEPT = (b"accept", b"application/json, text/event-stream")
+
+
+def _scan_response_headers(headers: t.Iterable[tuple[bytes, bytes]]) -> tuple[str, t.Optional[str]]:
+    """Return (content-type, session id) from raw ASGI response headers in one pass."""
+    content_type = ""
+    sid: t.Optional[str] = None
+    alt_sid: t.Optional[str] = None
+    for name, value in headers:
+        name = name.lower()
+        if name == b"content-type":
+            content_type = value.decode("latin1")
+        elif name == b"mcp-session-id":
+            sid = value.decode("latin1")
+        elif name == b"x-mcp-session-id":
+            alt_sid = value.decode("latin1")
+    return content_type, sid or alt_sid
+
+
+class _LazyHeaders(t.Mapping[str, str]):
+    """Read-only, case-insensitive view over raw ASGI headers.
+
+    Values are decoded (latin1) only when looked up and memoized per key, so a
+    request whose consumers read one or two headers doesn't decode all of them
+    (the interceptor looks up the session headers by name). Iteration decodes
+    everything once. As with a dict built from the list, the
+    last occurrence of a name wins.
+    """
+
+    __slots__ = ("_raw", "_cache", "_all")
+
+    def __init__(self, raw: t.Iterable[tuple[bytes, bytes]]) -> None:
+        self._raw = raw
+        self._cache: dict[str, t.Optional[str]] = {}
+        self._all: t.Optional[dict[str, str]] = None
+
+    def __getitem__(self, key: str) -> str:
+        if self._all is not None:
+            return self._all[key.lower()]
+        try:
+            value = self._cache[key]
+        except KeyError:
+            name = key.lower().encode("latin1")
+            value = None
+            for k, v in self._raw:
+                if k.lower() == name:
+                    value = v.decode("latin1")
+            self._cache[key] = value
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def _decoded(self) -> dict[str, str]:
+        if self._all is None:
+            self._all = {k.decode("latin1").lower(): v.decode("latin1") for k, v in self._raw}
+        return self._all
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self._decoded())
+
+    def __len__(self) -> int:
+        return len(self._decoded())
+
+    def items(self) -> t.ItemsView[str, str]:
+        return self._decoded().items()
+
+
+class _SSEDataDecoder:
+    """Incremental SSE decoder yielding the joined `data:` payload of each complete event.
+
+    Bytes are buffered across chunks so events split over several ASGI body
+    messages are reassembled. Line splitting is done by `bytes.split` in C
+    rather than a per-line Python scan.
+    """
+
+    __slots__ = ("_buf", "_data")
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._data: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        buf = self._buf
+        if b"\n" not in chunk:
+            # No line completes in this chunk
+            buf += chunk
+            return []
+        if buf:
+            buf += chunk
+            data = bytes(buf)
+            buf.clear()
+        else:
+            # Common case: chunk starts on a line boundary, split it without copying into the buffer
+            data = chunk
+        # One C-level split for every line in the chunk; the last piece is the partial tail
+        *lines, tail = data.split(b"\n")
+        buf += tail
+        events: list[bytes] = []
+        pending = self._data
+        # Line handling is inlined here (see `_line`): this loop runs once per SSE line.
+        # Prefix tests are fixed-width slice compares rather than startswith/endswith calls.
+        for line in lines:
+            if line[-1:] == b"\r":
+                line = line[:-1]
+            if not line:
+                if pending:
+                    events.append(b"\n".join(pending))
+                    pending.clear()
+            elif line[:5] == b"data:":
+                pending.append(line[6:] if line[5:6] == b" " else line[5:])
+        return events
+
+    def flush(self) -> list[bytes]:
+        """Dispatch whatever is pending when the stream ends without a final blank line."""
+        events: list[bytes] = []
+        if self._buf:
+            self._line(bytes(self._buf), events)
+            self._buf.clear()
+        self._line(b"", events)
+        return events
+
+    def _line(self, line: bytes, events: list[bytes]) -> None:
+        if line[-1:] == b"\r":
+            line = line[:-1]
+        if not line:
+            if self._data:
+                events.append(b"\n".join(self._data))
+                self._data.clear()
+        elif line[:5] == b"data:":
+            self._data.append(line[6:] if line[5:6] == b" " else line[5:])
+
+
+def _response_mode(content_type: str) -> int:
+    """Classify a response content type once; the media type leads, parameters follow after ';'."""
+    media_type = content_type.lstrip()
+    if media_type.startswith("application/json"):
+        return _MODE_JSON
+    if media_type.startswith("text/event-stream"):
+        return _MODE_SSE
+    # Uncommon casing or ordering: fall back to a substring scan
+    lowered = media_type.lower()
+    if "application/json" in lowered:
+        return _MODE_JSON
+    if "text/event-stream" in lowered:
+        return _MODE_SSE
+    return _MODE_SKIP
+
+
+def _session_status(sess_obj: SessionRecord) -> str:
+    status = sess_obj.get("status", "") if isinstance(sess_obj, t.Mapping) else getattr(sess_obj, "status", "")
+    if isinstance(status, SessionStatus):
+        # Enum values are already canonical upper-case strings
+        return status.value
+    return str(getattr(status, "value", status)).upper()
+
+
+async def _read_body(receive: Receive) -> bytes:
+    """Buffer the full request body (Streamable HTTP uses normal POST for JSON-RPC).
+
+    A single-chunk body is returned as-is; only multi-chunk bodies are grown in place.
+    """
+    body_buf: bytearray | None = None
+    while True:
+        message = await receive()
+        if message.get("type") != "http.request":
+            # Non-body message; unlikely for HTTP requests, but pass through
+            break
+        chunk = message.get("body", b"")
+        more_body = bool(message.get("more_body", False))
+        if body_buf is None:
+            if not more_body:
+                return chunk
+            body_buf = bytearray(chunk)
+        else:
+            body_buf += chunk
+        if not more_body:
+            break
+    return bytes(body_buf) if body_buf is not None else b""
+
+
+class _RequestCtx:
+    """Per-request interception state.
+
+    Its bound `receive`/`send` are handed to the inner app in place of
+    per-request closures over nonlocal cells.
+    """
+
+    __slots__ = (
+        "_interceptor",
+        "_logger",
+        "_debug",
+        "_full_payloads",
+        "_raw_threshold",
+        "_receive",
+        "_send",
+        "context",
+        "body",
+        "body_sent",
+        "session_id",
+        "content_type",
+        "response_mode",
+        "sse_decoder",
+    )
+
+    def __init__(
+        self,
+        interceptor: ProtocolInterceptor,
+        logger: logging.Logger,
+        receive: Receive,
+        send: Send,
+        context: t.Dict[str, t.Any],
+        body: bytes,
+        debug: bool = False,
+        full_payloads: bool = True,
+        raw_threshold: t.Optional[int] = None,
+    ) -> None:
+        self._interceptor = interceptor
+        self._logger = logger
+        # Debug level resolved once per request; hot-path log calls are skipped entirely when off
+        self._debug = debug
+        # False when the interceptor only needs routing fields of each response
+        self._full_payloads = full_payloads
+        # Responses above this size are handed to the interceptor as raw bytes, unparsed
+        self._raw_threshold = raw_threshold
+        self._receive = receive
+        self._send = send
+        self.context = context
+        # Body replayed to the inner app on its first receive()
+        self.body = body
+        self.body_sent = False
+        self.session_id: t.Optional[str] = None
+        self.content_type = ""
+        self.response_mode = _MODE_SKIP
+        self.sse_decoder: t.Optional[_SSEDataDecoder] = None
+
+    async def receive(self) -> t.Dict[str, t.Any]:
+        # Replay the (possibly modified) body once, then passthrough
+        if not self.body_sent:
+            self.body_sent = True
+            body = self.body
+            self.body = b""
+            if self._debug:
+                self._logger.debug("ASGIWrapper: wrapped_receive -> http.request bytes=%d more=False", len(body))
+            # A fresh dict every time: downstream apps and middleware may mutate the message
+            return {"type": "http.request", "body": body, "more_body": False}
+        # After first request body, forward original receive (disconnect, etc.)
+        msg = await self._receive()
+        if self._debug:
+            self._logger.debug("ASGIWrapper: passthrough receive type=%s", msg.get("type"))
+        return msg
+
+    async def send(self, message: t.Dict[str, t.Any]) -> None:
+        msg_type = message.get("type")
+        if msg_type == "http.response.start":
+            # Capture content type and server-provided session id as early as possible (single pass)
+            try:
+                self.content_type, sid = _scan_response_headers(message.get("headers") or ())
+            except (AttributeError, TypeError, ValueError):
+                # Malformed header list: observe nothing, forward as-is
+                self.content_type, sid = "", None
+            self.response_mode = _response_mode(self.content_type)
+            if sid:
+                self.session_id = sid
+                # Persist on context for downstream consumers
+                self.context["_mcp_db_session_id"] = sid
+            if self._debug:
+                self._logger.debug(
+                    "ASGIWrapper: response.start content_type=%s sid=%s", self.content_type, self.session_id
+                )
+            await self._send(message)
+            return
+
+        if msg_type == "http.response.body":
+            body: bytes = message.get("body", b"")
+            more = bool(message.get("more_body", False))
+            session_id = self.session_id
+            if self._debug:
+                self._logger.debug(
+                    "ASGIWrapper: response.body bytes=%d more=%s content_type=%s sid=%s",
+                    len(body),
+                    more,
+                    self.content_type,
+                    session_id,
+                )
+
+            # Without a session id there is nothing to record, so the body isn't parsed at all
+            # (server-provided session id headers were already captured at response.start)
+            if session_id:
+                # JSON mode: intercept once when body is complete
+                if self.response_mode == _MODE_JSON and not more:
+                    resp_json = await self._decode(body) if body else {}
+                    if resp_json is not None:
+                        # We do not rewrite the body to avoid altering server semantics
+                        await self._observe(session_id, resp_json)
+
+                # SSE mode: decode events incrementally across chunks; do not modify payload, only observe
+                elif self.response_mode == _MODE_SSE:
+                    if self.sse_decoder is None:
+                        self.sse_decoder = _SSEDataDecoder()
+                    events = self.sse_decoder.feed(body)
+                    if not more:
+                        events += self.sse_decoder.flush()
+                    for data in events:
+                        if self._debug:
+                            self._logger.debug("ASGIWrapper: SSE event data len=%d", len(data))
+                        parsed = await self._decode(data)
+                        # Ignore non-JSON data
+                        if parsed is not None:
+                            await self._observe(session_id, parsed)
+
+        # Forward everything unchanged
+        await self._send(message)
+
+    async def _decode(self, data: bytes) -> t.Any:
+        """Decode one response message for the interceptor; None when it isn't JSON."""
+        if not self._full_payloads:
+            return peek_jsonrpc_fields(data)
+        if self._raw_threshold is not None and len(data) > self._raw_threshold:
+            # Oversized message: the interceptor records the bytes without a full parse
+            return bytes(data)
+        try:
+            # Large results (e.g. big tool outputs) are parsed off the event loop
+            return await json_loads_async(data)
+        except ValueError:
+            return None
+
+    async def _observe(self, session_id: str, response: t.Any) -> None:
+        try:
+            await self._interceptor.handle_outgoing(session_id, response, context=self.context)
+        except Exception:
+            # Persistence failures never break the response stream
+            pass
 
 
 class ASGITransportWrapper:
@@ -31,15 +381,42 @@ class ASGITransportWrapper:
         interceptor: ProtocolInterceptor,
         admission_controller: t.Optional[TransportAdmissionController] = None,
         *,
-        session_lookup: t.Optional[t.Callable[[str], t.Awaitable[t.Optional[t.Dict[str, t.Any]]]]] = None,
+        session_lookup: t.Optional[SessionLookup] = None,
+        json_encoder: t.Optional[t.Callable[[t.Any], bytes]] = None,
+        max_warmed_sessions: int = 8192,
     ) -> None:
         self._interceptor = interceptor
         self._admission = admission_controller
-        # warmed sessions on this node to avoid duplicate internal warming
-        self._warmed: set[str] = set()
+        # warmed sessions on this node to avoid duplicate internal warming;
+        # bounded LRU so churned sessions don't accumulate for the life of the process
+        self._warmed: "OrderedDict[str, None]" = OrderedDict()
+        self._max_warmed = max_warmed_sessions
+        # In-flight admissions by session id; concurrent requests for a cold session share one warm-up
+        self._admitting: t.Dict[str, anyio.Event] = {}
         # Optional injector for fetching session objects without importing storage here
         self._session_lookup = session_lookup
+        # Encoder for bodies the wrapper re-serializes; defaults to orjson when installed, else stdlib json
+        self._json_encoder = json_encoder or json_dumps
+        # The warm-up body never changes; encoded with the configured encoder on first warm, then reused
+        self._warm_body: t.Optional[bytes] = None
+        # Re-encode forwarded messages only if the interceptor may have changed them
+        self._rewrites_messages = bool(getattr(interceptor, "rewrites_messages", True))
+        # Parse whole responses only if the interceptor consumes more than their routing fields
+        self._full_payloads = bool(getattr(interceptor, "needs_full_payload", True))
+        raw_threshold = getattr(interceptor, "raw_response_threshold", None)
+        self._raw_threshold: t.Optional[int] = raw_threshold if isinstance(raw_threshold, int) else None
         self._logger = logging.getLogger(__name__)
+        # Last seen scope["server"] and its derived id; servers reuse one address object per listener/connection
+        self._last_server: t.Any = None
+        self._last_server_id = "unknown"
+
+    def _server_id(self, server: t.Any) -> str:
+        if server is self._last_server:
+            return self._last_server_id
+        server_id = (server[0] if server else "") or "unknown"
+        self._last_server = server
+        self._last_server_id = server_id
+        return server_id
 
     def wrap(self, inner_app: t.Callable[[Scope, Receive, Send], t.Awaitable[None]]):
         async def app(scope: Scope, receive: Receive, send: Send) -> None:
@@ -48,322 +425,231 @@ class ASGITransportWrapper:
                 await inner_app(scope, receive, send)
                 return
 
-            try:
+            debug = self._logger.isEnabledFor(logging.DEBUG)
+            if debug:
                 self._logger.debug(
                     "ASGIWrapper: http request method=%s path=%s",
                     scope.get("method"),
                     scope.get("path"),
                 )
-            except Exception:
-                pass
 
-            # Build headers dict for context
-            headers_dict: dict[str, str] = {}
-            try:
-                for key_bytes, val_bytes in scope.get("headers", []) or []:
-                    headers_dict[key_bytes.decode("latin1").lower()] = val_bytes.decode("latin1")
-            except Exception:
-                headers_dict = {}
-
-            context = {"headers": headers_dict, "server_id": scope.get("server", ("", ""))[0] or "unknown"}
-
-            # Buffer the full request body (Streamable HTTP uses normal POST for JSON-RPC)
-            body_chunks: list[bytes] = []
-            more_body = True
-            while more_body:
-                message = await receive()
-                if message.get("type") == "http.request":
-                    body_chunks.append(message.get("body", b""))
-                    more_body = bool(message.get("more_body", False))
-                    if not more_body:
-                        break
-                else:
-                    # Non-body message; unlikely for HTTP requests, but pass through
-                    body_chunks.append(b"")
-                    more_body = False
-                    break
-            original_body = b"".join(body_chunks)
+            # Raw headers are read once and shared by the context view and warm-up
+            raw_headers = (scope["headers"] if "headers" in scope else None) or ()
+            # Headers for context, decoded lazily on lookup
+            headers_dict = _LazyHeaders(raw_headers)
+
+            context = {"headers": headers_dict, "server_id": self._server_id(scope.get("server"))}
+
+            original_body = await _read_body(receive)
+            state = _RequestCtx(
+                self._interceptor,
+                self._logger,
+                receive,
+                send,
+                context,
+                original_body,
+                debug,
+                self._full_payloads,
+                self._raw_threshold,
+            )
 
             # Intercept incoming JSON-RPC message if any
-            modified_body_bytes = original_body
-            session_id: str | None = None
-            if original_body:
+            payload: t.Optional[t.Dict[str, t.Any]] = None
+            # JSON-RPC method of the request, reused by admission so the body isn't parsed twice
+            incoming_method: str | None = None
+            method_known = False
+            # Only JSON-RPC-looking bodies are intercepted; other payloads are forwarded untouched
+            if original_body and (
+                "application/json" in headers_dict.get("content-type", "") or original_body[:1] in (b"{", b"[")
+            ):
                 try:
-                    payload_text = original_body.decode("utf-8", errors="ignore")
-                    self._logger.debug("ASGIWrapper: incoming body bytes=%d", len(original_body))
-                    forwarded = await self._interceptor.handle_incoming(payload_text, context=context)
+                    if debug:
+                        self._logger.debug("ASGIWrapper: incoming body bytes=%d", len(original_body))
+                    # Hand over the raw bytes; the interceptor parses them without a str copy
+                    forwarded = await self._interceptor.handle_incoming(original_body, context=context)
                     if "_raw" in forwarded:
                         # Keep raw bytes
-                        modified_body_bytes = (
+                        state.body = (
                             forwarded["_raw"].encode("utf-8")
                             if isinstance(forwarded["_raw"], str)
                             else forwarded["_raw"]
                         )
                     else:
-                        modified_body_bytes = json.dumps(forwarded).encode("utf-8")
-                    # Best-effort extraction for outgoing interception
-                    session_id = self._interceptor._extract_session_id(
-                        forwarded if isinstance(forwarded, dict) else {}, context
-                    )
-                    if not session_id and context and "_mcp_db_session_id" in context:
-                        session_id = t.cast(str, context.get("_mcp_db_session_id"))
-                    self._logger.debug("ASGIWrapper: extracted sid from incoming=%s", session_id)
+                        if self._rewrites_messages:
+                            state.body = self._json_encoder(forwarded)
+                        if isinstance(forwarded, dict):
+                            incoming_method = forwarded.get("method")
+                            method_known = True
+                    if isinstance(forwarded, dict):
+                        payload = forwarded
                 except Exception:
                     # On parse/interceptor error, fall back to original body
-                    modified_body_bytes = original_body
-                    session_id = None
-
-            # For GET/SSE or empty-body POSTs, derive session from headers if available
-            if session_id is None:
-                try:
-                    session_id = self._interceptor._extract_session_id({}, context)
-                except Exception:
-                    session_id = None
-
-            # Create a custom receive that replays the modified body once, then passthrough
-            first_receive_done: bool = False
-
-            async def wrapped_receive() -> t.Dict[str, t.Any]:
-                nonlocal modified_body_bytes, first_receive_done
-                if not first_receive_done:
-                    first_receive_done = True
-                    body = modified_body_bytes
-                    modified_body_bytes = b""
-                    self._logger.debug(
-                        "ASGIWrapper: wrapped_receive -> http.request bytes=%d more=False",
-                        len(body),
-                    )
-                    return {"type": "http.request", "body": body, "more_body": False}
-                # After first request body, forward original receive (disconnect, etc.)
-                msg = await receive()
-                self._logger.debug("ASGIWrapper: passthrough receive type=%s", msg.get("type"))
-                return msg
-
-            # Intercept outgoing send calls
-            response_headers: list[tuple[bytes, bytes]] | None = None
-            content_type: str = ""
-
-            async def wrapped_send(message: t.Dict[str, t.Any]) -> None:
-                nonlocal response_headers, content_type, session_id
-                if message.get("type") == "http.response.start":
-                    response_headers = message.get("headers") or []
-                    # Determine content type if present
-                    try:
-                        header_map = {
-                            k.lower(): v
-                            for k, v in ((k.decode("latin1"), v.decode("latin1")) for k, v in response_headers)
-                        }
-                        content_type = header_map.get("content-type", "")
-                        # Capture server-provided session id as early as possible
-                        sid = header_map.get("mcp-session-id") or header_map.get("x-mcp-session-id")
-                        if sid:
-                            session_id = sid
-                            # Persist on context for downstream consumers
-                            if isinstance(context, dict):
-                                context["_mcp_db_session_id"] = sid
-                        self._logger.debug(
-                            "ASGIWrapper: response.start content_type=%s sid=%s",
-                            content_type,
-                            session_id,
-                        )
-                    except Exception:
-                        content_type = ""
-                    await send(message)
-                    return
-
-                if message.get("type") == "http.response.body":
-                    body: bytes = message.get("body", b"")
-                    more = bool(message.get("more_body", False))
-                    self._logger.debug(
-                        "ASGIWrapper: response.body bytes=%d more=%s content_type=%s sid=%s",
-                        len(body),
-                        more,
-                        content_type,
-                        session_id,
-                    )
-
-                    # JSON mode: try to intercept once when body is complete
-                    if content_type and "application/json" in content_type and not more:
-                        # Capture server-provided session id header on initialize
-                        try:
-                            if not session_id and response_headers:
-                                header_map = {
-                                    k.lower(): v
-                                    for k, v in ((k.decode("latin1"), v.decode("latin1")) for k, v in response_headers)
-                                }
-                                sid = header_map.get("mcp-session-id") or header_map.get("x-mcp-session-id")
-                                if sid:
-                                    session_id = sid
-                        except Exception:
-                            # ignore header parsing errors
-                            pass
-                        try:
-                            resp_json = json.loads(body.decode("utf-8")) if body else {}
-                            if session_id:
-                                _ = await self._interceptor.handle_outgoing(session_id, resp_json, context=context)
-                            # We do not rewrite the body to avoid altering server semantics
-                        except Exception:
-                            pass
-
-                    # SSE mode: best-effort parse of data: lines when chunks complete
-                    if content_type and "text/event-stream" in content_type:
-                        # Naive parse; do not modify payload, only observe
-                        try:
-                            text = body.decode("utf-8", errors="ignore")
-                            for line in text.splitlines():
-                                if line.startswith("data:"):
-                                    data = line[5:].strip()
-                                    if data:
-                                        try:
-                                            self._logger.debug("ASGIWrapper: SSE data line len=%d", len(data))
-                                            parsed = json.loads(data)
-                                            if session_id:
-                                                await self._interceptor.handle_outgoing(
-                                                    session_id, parsed, context=context
-                                                )
-                                        except Exception:
-                                            # Ignore non-JSON data lines
-                                            pass
-                        except Exception:
-                            pass
-
-                    await send(message)
-                    return
-
-                # Default pass-through
-                try:
-                    await send(message)
-                except Exception:
-                    # Ensure wrapper never raises to ASGI stack from here
-                    raise
+                    state.body = original_body
+                    payload = None
+
+            # Best-effort extraction for outgoing interception: params first, then headers
+            # (GET/SSE, empty-body POSTs and unparsable bodies have no payload)
+            session_id = self._interceptor.extract_session_id(payload, context)
+            if not session_id and "_mcp_db_session_id" in context:
+                session_id = t.cast(str, context.get("_mcp_db_session_id"))
+            if debug:
+                self._logger.debug("ASGIWrapper: extracted sid=%s", session_id)
+            state.session_id = session_id
 
             # Admission + warming: if applicable, attempt reconstruction BEFORE forwarding
-            # Only for non-initialize, non-initialized requests with a known session id
-            async def maybe_admit_and_warm() -> None:
-                if self._admission is None:
-                    return
-                try:
-                    # Determine method from buffered body if available
-                    method: str | None = None
-                    try:
-                        payload = json.loads(original_body.decode("utf-8")) if original_body else {}
-                        method = payload.get("method")
-                    except Exception:
-                        method = None
-
-                    # Skip only for initialize; for initialized/notifications we must admit
-                    if method == "initialize":
-                        return
-
-                    if not session_id:
-                        # Try grabbing from headers (GET/SSE)
-                        try:
-                            session_id_local = self._interceptor._extract_session_id({}, context)
-                        except Exception:
-                            session_id_local = None
-                    else:
-                        session_id_local = session_id
+            if self._admission is not None:
+                # Determine method from the parsed request, or peek at the buffered body
+                method = incoming_method if method_known else peek_jsonrpc_method(original_body)
+                await self._maybe_admit_and_warm(inner_app, scope, raw_headers, session_id, method)
 
-                    if not session_id_local:
-                        return
+            await inner_app(scope, state.receive, state.send)
 
-                    # If already present in SDK, nothing to do
-                    if self._admission.has_session(session_id_local):
-                        self._logger.debug(
-                            "ASGIWrapper: admission skip; session already present sid=%s", session_id_local
-                        )
-                        return
-
-                    # Consult storage (if provided) to check status and decide warming
-                    sess_obj: t.Optional[t.Dict[str, t.Any]] = None
-                    if self._session_lookup is not None:
-                        try:
-                            sess_obj = await self._session_lookup(session_id_local)
-                        except Exception:
-                            sess_obj = None
-
-                    # Reconstruct transport for INITIALIZED/ACTIVE; if unknown, best-effort reconstruct
-                    if sess_obj is not None:
-                        status = str(sess_obj.get("status", "")).upper()
-                        self._logger.debug("ASGIWrapper: admission storage status=%s sid=%s", status, session_id_local)
-                        if status in {"INITIALIZED", "ACTIVE"}:
-                            await self._admission.ensure_session_transport(session_id_local)
-                            # Warm when not yet warmed on this node (idempotent)
-                            if session_id_local not in self._warmed:
-                                self._logger.debug(
-                                    "ASGIWrapper: warming session sid=%s status=%s", session_id_local, status
-                                )
-                                await self._send_internal_initialized(inner_app, scope, session_id_local)
-                                self._warmed.add(session_id_local)
-                        # For INITIALIZING/CLOSED, do nothing here
-                    else:
-                        # No record in storage: still reconstruct to let SDK admit for initialized/other calls
-                        self._logger.debug(
-                            "ASGIWrapper: admission without storage record; reconstruct sid=%s", session_id_local
-                        )
-                        await self._admission.ensure_session_transport(session_id_local)
-                        # Do not auto-warm without DB truth
-                except Exception:
-                    # Never block request on admission errors
-                    pass
+        return app
+
+    async def _maybe_admit_and_warm(
+        self,
+        inner_app: t.Callable[[Scope, Receive, Send], t.Awaitable[None]],
+        scope: Scope,
+        raw_headers: t.Sequence[tuple[bytes, bytes]],
+        session_id: t.Optional[str],
+        method: t.Optional[str],
+    ) -> None:
+        """Reconstruct (and warm) this node's SDK transport for a known session before forwarding.
 
-            await maybe_admit_and_warm()
+        Only for non-initialize requests with a known session id.
+        """
+        assert self._admission is not None
+        try:
+            # Skip only for initialize; for initialized/notifications we must admit
+            if method == "initialize":
+                return
 
-            await inner_app(scope, wrapped_receive, wrapped_send)
+            # The request's session id already covers headers (GET/SSE) when there is no payload
+            session_id_local = session_id
+            if not session_id_local:
+                return
 
-        return app
+            # Another request is already admitting this session: wait for it rather than repeating
+            # the lookup and warm-up. The transport is registered before warming finishes, so
+            # has_session() alone would let this request reach the SDK ahead of the warm-up.
+            pending = self._admitting.get(session_id_local)
+            if pending is not None:
+                await pending.wait()
+                return
+
+            # If already present in SDK, nothing to do
+            if self._admission.has_session(session_id_local):
+                self._logger.debug("ASGIWrapper: admission skip; session already present sid=%s", session_id_local)
+                return
+
+            done = anyio.Event()
+            self._admitting[session_id_local] = done
+            try:
+                await self._admit(inner_app, scope, raw_headers, session_id_local)
+            finally:
+                del self._admitting[session_id_local]
+                done.set()
+        except Exception:
+            # Never block request on admission errors
+            pass
+
+    async def _admit(
+        self,
+        inner_app: t.Callable[[Scope, Receive, Send], t.Awaitable[None]],
+        scope: Scope,
+        raw_headers: t.Sequence[tuple[bytes, bytes]],
+        session_id_local: str,
+    ) -> None:
+        """Reconstruct the session's transport per its stored status, warming it when needed."""
+        assert self._admission is not None
+        # Consult storage (if provided) to check status and decide warming
+        sess_obj: t.Optional[SessionRecord] = None
+        if self._session_lookup is not None:
+            try:
+                sess_obj = await self._session_lookup(session_id_local)
+            except Exception:
+                sess_obj = None
+
+        # Reconstruct transport for INITIALIZED/ACTIVE; if unknown, best-effort reconstruct
+        if sess_obj is not None:
+            status = _session_status(sess_obj)
+            self._logger.debug("ASGIWrapper: admission storage status=%s sid=%s", status, session_id_local)
+            if status in {"INITIALIZED", "ACTIVE"}:
+                await self._admission.ensure_session_transport(session_id_local)
+                # Warm when not yet warmed on this node (idempotent)
+                if session_id_local not in self._warmed:
+                    self._logger.debug("ASGIWrapper: warming session sid=%s status=%s", session_id_local, status)
+                    await self._send_internal_initialized(inner_app, scope, session_id_local, raw_headers)
+                    self._mark_warmed(session_id_local)
+            # For INITIALIZING/CLOSED, do nothing here
+        else:
+            # No record in storage: still reconstruct to let SDK admit for initialized/other calls
+            self._logger.debug("ASGIWrapper: admission without storage record; reconstruct sid=%s", session_id_local)
+            await self._admission.ensure_session_transport(session_id_local)
+            # Do not auto-warm without DB truth
+
+    def _mark_warmed(self, session_id: str) -> None:
+        warmed = self._warmed
+        warmed[session_id] = None
+        warmed.move_to_end(session_id)
+        if len(warmed) > self._max_warmed:
+            # evict least recently warmed; a re-warm is an idempotent notification
+            warmed.popitem(last=False)
 
     async def _send_internal_initialized(
         self,
         inner_app: t.Callable[[Scope, Receive, Send], t.Awaitable[None]],
         scope: Scope,
         session_id: str,
+        raw_headers: t.Optional[t.Sequence[tuple[bytes, bytes]]] = None,
     ) -> None:
         """Send a one-shot internal notifications/initialized to warm this node.
 
         This request is not exposed to the client; we synthesize a POST with the
         correct header and consume the response locally.
         """
-        # Clone scope with adjusted headers to include the session id
-        headers_list: list[tuple[bytes, bytes]] = []
-        try:
-            headers_list = list(scope.get("headers", []))
-        except Exception:
-            headers_list = []
+        if raw_headers is None:
+            raw_headers = (scope["headers"] if "headers" in scope else None) or ()
+        # One pass over the client's headers to see which ones the warm-up request must add
+        present: set[bytes] = set()
+        protocol_version: t.Optional[bytes] = None
+        has_cased_protocol_version = False
+        for name, value in raw_headers:
+            lname = name.lower()
+            present.add(lname)
+            if lname == b"mcp-protocol-version":
+                protocol_version = value
+                has_cased_protocol_version = has_cased_protocol_version or name == b"MCP-Protocol-Version"
+
+        extra: list[tuple[bytes, bytes]] = []
         # Ensure mcp-session-id header present (add common casings for safety)
-        headers_lower = {k.decode("latin1").lower(): v for k, v in headers_list}
-        if "mcp-session-id" not in headers_lower and "x-mcp-session-id" not in headers_lower:
+        if b"mcp-session-id" not in present and b"x-mcp-session-id" not in present:
             sid_bytes = session_id.encode("latin1")
-            headers_list.append((b"mcp-session-id", sid_bytes))
-            headers_list.append((b"Mcp-Session-Id", sid_bytes))
-
+            extra.append((b"mcp-session-id", sid_bytes))
+            extra.append((b"Mcp-Session-Id", sid_bytes))
         # Ensure JSON content negotiation headers for internal POST
-        if "content-type" not in headers_lower:
-            headers_list.append((b"content-type", b"application/json"))
-        if "accept" not in headers_lower:
-            headers_list.append((b"accept", b"application/json, text/event-stream"))
+        if b"content-type" not in present:
+            extra.append(_WARM_CONTENT_TYPE)
+        if b"accept" not in present:
+            extra.append(_WARM_ACCEPT)
         # Ensure protocol version header casing exists
-        if "mcp-protocol-version" in headers_lower and b"MCP-Protocol-Version" not in dict(headers_list):
-            try:
-                pv = headers_lower["mcp-protocol-version"].encode("latin1")
-                headers_list.append((b"MCP-Protocol-Version", pv))
-            except Exception:
-                pass
+        if protocol_version is not None and not has_cased_protocol_version:
+            extra.append((b"MCP-Protocol-Version", protocol_version))
+        # Clone scope with adjusted headers to include the session id
+        headers_list = [*raw_headers, *extra]
 
         warm_scope = dict(scope)
         warm_scope["headers"] = headers_list
 
-        warm_payload = {
-            "jsonrpc": "2.0",
-            "method": "notifications/initialized",
-        }
-        body_bytes = json.dumps(warm_payload).encode("utf-8")
+        if self._warm_body is None:
+            self._warm_body = self._json_encoder(_WARM_MESSAGE)
+        warm_body = self._warm_body
 
         async def warm_receive() -> t.Dict[str, t.Any]:
-            nonlocal body_bytes
-            b = body_bytes
-            body_bytes = b""
-            return {"type": "http.request", "body": b, "more_body": False}
+            # The warm-up body once, then empty bodies
+            nonlocal warm_body
+            body, warm_body = warm_body, b""
+            return {"type": "http.request", "body": body, "more_body": False}
 
         async def warm_send(_message: t.Dict[str, t.Any]) -> None:  # consume silently
             return
@@ -1,14 +1,27 @@
 from __future__ import annotations
 
-import json
+import os
 import typing as t
 import uuid
 
+from mcp_db.utils.serialization import json_loads_async, peek_jsonrpc_fields
+
 from .models import BaseEvent, MCPSession, SessionStatus
 from .session_manager import SessionManager
 
 JSON = t.Dict[str, t.Any]
 
+# Context key memoizing the header-derived session id as (headers object, session id)
+_HEADER_SID_KEY = "_mcp_db_header_sid"
+# Headers that may carry the session id, in order of precedence (last-event-id for SSE resumption)
+_SESSION_HEADERS = ("mcp-session-id", "x-mcp-session-id", "last-event-id")
+# Context key carrying the session id resolved by handle_incoming (None when the message had none)
+_INCOMING_SID_KEY = "_mcp_db_incoming_sid"
+# Status members bound once at import: module globals are cheaper to load than enum class attributes
+_STATUS_INITIALIZED = SessionStatus.INITIALIZED
+_STATUS_ACTIVE = SessionStatus.ACTIVE
+_STATUS_CLOSED = SessionStatus.CLOSED
+
 
 class ProtocolInterceptor:
     """Intercepts JSON-RPC messages for MCP over any transport.
@@ -17,24 +30,38 @@ class ProtocolInterceptor:
     forward requests to the wrapped server and to send responses back.
     """
 
+    # handle_incoming only observes messages; transports may forward the original bytes
+    # instead of re-serializing. Subclasses that modify messages must set this to True.
+    rewrites_messages: bool = False
+    # handle_outgoing records whole responses. Subclasses that only route on `jsonrpc`/`id`/`method`
+    # may set this to False so transports pass those fields without fully parsing each response.
+    needs_full_payload: bool = True
+    # Responses larger than this many bytes reach handle_outgoing as raw JSON bytes: only the routing
+    # fields are peeked and the JSON text is recorded instead of a parsed object. None parses everything.
+    raw_response_threshold: t.Optional[int] = None
+
     def __init__(self, session_manager: SessionManager) -> None:
         self._sessions = session_manager
 
-    async def handle_incoming(self, raw_message: str, context: t.Optional[dict] = None) -> JSON:
+    async def handle_incoming(self, raw_message: t.Union[str, bytes], context: t.Optional[dict] = None) -> JSON:
         """Handle an incoming client message.
 
+        `raw_message` may be the undecoded request body; bytes are parsed directly.
         Returns a possibly augmented JSON-RPC message to forward to the server.
         """
         try:
-            message: JSON = json.loads(raw_message)
-        except json.JSONDecodeError:
+            message: JSON = await json_loads_async(raw_message)
+        except ValueError:
             # Forward as-is but we can't intercept
             return {"_raw": raw_message}
 
         method = message.get("method")
         params = message.get("params", {})
         # Only ever use server/transport-provided session IDs. We do not generate them.
-        session_id = self._extract_session_id(message, context)
+        session_id = self.extract_session_id(message, context)
+        if isinstance(context, dict):
+            # Lets callers reuse the id instead of extracting it again
+            context[_INCOMING_SID_KEY] = session_id
 
         if session_id is None:
             # No session context, forward as-is
@@ -46,36 +73,71 @@ class ProtocolInterceptor:
             except Exception:
                 pass
 
-        if method == "initialize":
-            # Do not create session here; capture event if we already know a session
-            if session_id:
-                await self._append_event(session_id, "MessageReceivedEvent", {"method": method, "params": params})
-            # Stash initialize request params for later session creation
-            if isinstance(context, dict):
-                context["_mcp_db_init_params"] = params
-        elif method in {"initialized", "notifications/initialized"}:
-            if session_id:
-                await self._sessions.update(session_id, {"status": SessionStatus.ACTIVE})
-                await self._append_event(session_id, "SessionInitializedEvent", {})
-        elif method in {"tools/call", "resources/read", "prompts/get"}:
-            if session_id:
-                await self._append_event(session_id, "MessageReceivedEvent", {"method": method, "params": params})
+        handler = self._INCOMING_HANDLERS.get(method)
+        if handler is None:
+            await self._on_message(session_id, message, method, params, context)
         else:
-            # Default path: still track
-            if session_id:
-                await self._append_event(session_id, "MessageReceivedEvent", {"method": method, "params": params})
+            await handler(self, session_id, message, method, params, context)
 
         return message
 
-    async def handle_outgoing(self, session_id: str, response: JSON, context: t.Optional[dict] = None) -> JSON:
-        """Handle a server response before sending to client."""
+    async def _on_initialize(
+        self, session_id: str, message: JSON, method: str, params: t.Any, context: t.Optional[dict]
+    ) -> None:
+        # Do not create session here; capture event if we already know a session
+        if session_id:
+            await self._append_event(session_id, "MessageReceivedEvent", {"method": method, "params": params})
+        # Stash initialize request params for later session creation
+        if isinstance(context, dict):
+            context["_mcp_db_init_params"] = params
+
+    async def _on_initialized(
+        self, session_id: str, message: JSON, method: str, params: t.Any, context: t.Optional[dict]
+    ) -> None:
+        if session_id:
+            await self._sessions.update(session_id, {"status": _STATUS_ACTIVE})
+            await self._append_event(session_id, "SessionInitializedEvent", {})
+
+    async def _on_message(
+        self, session_id: str, message: JSON, method: str, params: t.Any, context: t.Optional[dict]
+    ) -> None:
+        # tools/call, resources/read, prompts/get and every other method: still track
+        if session_id:
+            await self._append_event(session_id, "MessageReceivedEvent", {"method": method, "params": params})
+
+    # Lifecycle methods with dedicated handling; anything else goes to `_on_message`
+    _INCOMING_HANDLERS: t.ClassVar[t.Dict[str, t.Callable[..., t.Awaitable[None]]]] = {
+        "initialize": _on_initialize,
+        "initialized": _on_initialized,
+        "notifications/initialized": _on_initialized,
+    }
+
+    async def handle_outgoing(
+        self, session_id: str, response: t.Union[JSON, bytes], context: t.Optional[dict] = None
+    ) -> t.Union[JSON, bytes]:
+        """Handle a server response before sending to client.
+
+        `response` may be the raw JSON bytes of an oversized message (see `raw_response_threshold`);
+        those are recorded as their JSON text, with only `id` and `method` peeked from the bytes.
+        """
+        if isinstance(response, (bytes, bytearray)):
+            # Only the top-level method is needed (to spot server/disconnect); the peek never reports nested keys
+            head = peek_jsonrpc_fields(response)
+            if head is None:
+                # Not a JSON-RPC object: nothing to record
+                return response
+            # Event payloads must stay JSON-serializable for storages that persist them, which bytes are not
+            recorded: t.Union[JSON, str] = response.decode("utf-8", "replace")
+        else:
+            head = recorded = response
         # If this is the initialize response, register/update the session using server-provided id
         last_method = context.get("_mcp_db_last_method") if isinstance(context, dict) else None
-        existing = await self._sessions.get(session_id) if session_id else None
         if last_method == "initialize" and session_id:
+            # Only the initialize response needs to know whether the session is already stored
+            existing = await self._sessions.get(session_id)
             init_params = context.get("_mcp_db_init_params") if isinstance(context, dict) else None
             base = {
-                "status": SessionStatus.INITIALIZED,
+                "status": _STATUS_INITIALIZED,
                 "client_id": str((init_params or {}).get("clientInfo", {}).get("name", "unknown")),
                 "server_id": str(context.get("server_id") if context else "unknown"),
                 "capabilities": (init_params or {}).get("capabilities", {}),
@@ -84,35 +146,58 @@ class ProtocolInterceptor:
             if existing is None:
                 session = MCPSession(id=session_id, **base)
                 await self._sessions.create(session)
-                await self._append_event(session_id, "SessionCreatedEvent", {"response": response})
+                await self._append_event(session_id, "SessionCreatedEvent", {"response": recorded})
             else:
                 await self._sessions.update(session_id, base)
 
-        await self._append_event(session_id, "MessageSentEvent", {"response": response})
-        if response.get("method") == "server/disconnect":
-            await self._sessions.update(session_id, {"status": SessionStatus.CLOSED})
+        await self._append_event(session_id, "MessageSentEvent", {"response": recorded})
+        if head.get("method") == "server/disconnect":
+            await self._sessions.update(session_id, {"status": _STATUS_CLOSED})
             await self._append_event(session_id, "SessionClosedEvent", {})
         return response
 
+    def extract_session_id(self, message: t.Optional[JSON], context: t.Optional[dict]) -> t.Optional[str]:
+        """Return the session id from the message params, falling back to the request headers.
+
+        `message` may be None for requests without a JSON-RPC body (GET/SSE). The header
+        lookup is memoized on `context`, so repeated calls for one request scan headers once.
+        Returns None rather than raising when neither source carries an id.
+        """
+        if message:
+            params = message.get("params")
+            sid = params.get("session_id") if isinstance(params, dict) else None
+            if sid:
+                return str(sid)
+        return self._header_session_id(context)
+
     def _extract_session_id(self, message: JSON, context: t.Optional[dict]) -> t.Optional[str]:
-        # Try params, headers (in context), or previously established mapping
-        params = message.get("params") or {}
-        sid = params.get("session_id")
-        if sid:
-            return str(sid)
-        if context and "headers" in context:
-            headers = {k.lower(): v for k, v in context["headers"].items()}
-            if "mcp-session-id" in headers:
-                return headers["mcp-session-id"]
-            if "x-mcp-session-id" in headers:
-                return headers["x-mcp-session-id"]
-            if "last-event-id" in headers:  # SSE
-                return headers["last-event-id"]
-        return None
+        return self.extract_session_id(message, context)
+
+    def _header_session_id(self, context: t.Optional[dict]) -> t.Optional[str]:
+        if not context or "headers" not in context:
+            return None
+        raw_headers = context["headers"]
+        cached = context.get(_HEADER_SID_KEY)
+        if cached is not None and cached[0] is raw_headers:
+            return cached[1]
+        headers = raw_headers
+        # Non-dict mappings (the ASGI wrapper's lazy view, Starlette's Headers) are case-insensitive and are
+        # read directly, so nothing is decoded or copied. Only a plain dict with mixed-case names gets a
+        # lower-cased copy, which keeps the mcp-session-id > x-mcp-session-id > last-event-id precedence.
+        if isinstance(headers, dict) and any(k != k.lower() for k in headers):
+            headers = {k.lower(): v for k, v in headers.items()}
+        sid = None
+        for name in _SESSION_HEADERS:
+            sid = headers.get(name)
+            if sid is not None:
+                break
+        context[_HEADER_SID_KEY] = (raw_headers, sid)
+        return sid
 
     def _generate_session_id(self) -> str:
         return uuid.uuid4().hex
 
     async def _append_event(self, session_id: str, event_type: str, payload: JSON) -> None:
-        event = BaseEvent(event_id=uuid.uuid4().hex, session_id=session_id, event_type=event_type, payload=payload)
+        # 128 random bits as 32 hex chars, like uuid4().hex without building a UUID object
+        event = BaseEvent(event_id=os.urandom(16).hex(), session_id=session_id, event_type=event_type, payload=payload)
         await self._sessions.append_event(event)
@@ -18,7 +18,7 @@ class SessionStatus(str, enum.Enum):
 Capabilities = t.Dict[str, t.Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPSession:
     id: str
     status: SessionStatus
@@ -26,18 +26,26 @@ class MCPSession:
     server_id: str
     capabilities: Capabilities
     metadata: t.Dict[str, t.Any] = field(default_factory=dict)
-    created_at: float = field(default_factory=lambda: time.time())
-    updated_at: float = field(default_factory=lambda: time.time())
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
     last_event_id: t.Optional[str] = None
 
+    def __post_init__(self) -> None:
+        # Normalize on write (e.g. plain strings decoded from storage) so readers can rely on the enum
+        if not isinstance(self.status, SessionStatus):
+            try:
+                self.status = SessionStatus(self.status)
+            except ValueError:
+                pass
+
 
 # Event sourcing model
-@dataclass
+@dataclass(slots=True)
 class BaseEvent:
     event_id: str
     session_id: str
     event_type: str
-    timestamp: float = field(default_factory=lambda: time.time())
+    timestamp: float = field(default_factory=time.time)
     payload: t.Dict[str, t.Any] = field(default_factory=dict)
 
 
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import typing as t
 
 from mcp_db.cache.local_cache import LocalCache
-from mcp_db.event.base import EventStore
-from mcp_db.session import StorageAdapter
-from mcp_db.utils.resilience import CircuitBreaker, CircuitBreakerConfig, with_retries
+from mcp_db.utils.resilience import CircuitBreaker, CircuitBreakerConfig
 
 from .models import MCPEvent, MCPSession
 
+if t.TYPE_CHECKING:
+    # Annotation-only: importing mcp_db.session here would cycle back through mcp_db.core
+    # when mcp_db.session is the first module imported
+    from mcp_db.event.base import EventStore
+    from mcp_db.session import StorageAdapter
+
+# Cached marker for "no such session" when negative caching is enabled
+_MISS = object()
+
 
 class SessionManager:
     """Manages session lifecycle with caching, event sourcing, and resilience."""
@@ -22,6 +30,7 @@ class SessionManager:
         circuit_breaker: t.Optional[CircuitBreaker] = None,
         retry_attempts: int = 3,
         retry_backoff_ms: t.Optional[t.List[int]] = None,
+        negative_cache_ttl: t.Optional[float] = None,
     ) -> None:
         self._storage = storage
         self._event_store = event_store
@@ -33,12 +42,37 @@ class SessionManager:
         self._breaker = circuit_breaker or CircuitBreaker(CircuitBreakerConfig())
         self._retry_attempts = retry_attempts
         self._retry_backoff_ms = retry_backoff_ms or [100, 500, 2000]
+        # Seconds to remember a storage miss (absorbs reconnect storms for unknown ids); off by default
+        # because a session created on another node stays invisible here for up to this long
+        self._negative_cache_ttl = negative_cache_ttl
 
-    async def create(self, session: MCPSession) -> None:
-        async def _op() -> None:
-            await self._storage.create_session(session)
+    async def _protected(self, fn: t.Callable[..., t.Awaitable[t.Any]], *args: t.Any) -> t.Any:
+        """Await `fn(*args)` with retries, guarded by the circuit breaker.
 
-        await self._breaker.run(lambda: with_retries(_op, self._retry_attempts, self._retry_backoff_ms))
+        Same semantics as `breaker.run(lambda: with_retries(...))` (one breaker check and one
+        success/failure record per call), without allocating closures on every storage op.
+        """
+        breaker = self._breaker
+        if not breaker.allow_request():
+            raise RuntimeError("circuit_open")
+        backoff = self._retry_backoff_ms
+        last_attempt = self._retry_attempts - 1
+        attempt = 0
+        while True:
+            try:
+                result = await fn(*args)
+            except Exception:
+                if attempt >= last_attempt:
+                    breaker.record_failure()
+                    raise
+                await asyncio.sleep(backoff[min(attempt, len(backoff) - 1)] / 1000.0)
+                attempt += 1
+            else:
+                breaker.record_success()
+                return result
+
+    async def create(self, session: MCPSession) -> None:
+        await self._protected(self._storage.create_session, session)
         if self._cache:
             self._cache.set(session.id, session)
 
@@ -46,32 +80,31 @@ class SessionManager:
         # Check local cache first if enabled
         if self._cache:
             cached = self._cache.get(session_id)
+            if cached is _MISS:
+                return None
             if cached is not None:
                 return cached
 
-        async def _op() -> t.Optional[MCPSession]:
-            return await self._storage.get_session(session_id)
-
-        session = await self._breaker.run(lambda: with_retries(_op, self._retry_attempts, self._retry_backoff_ms))
-        if session is not None and self._cache:
-            self._cache.set(session_id, session)
+        session = await self._protected(self._storage.get_session, session_id)
+        if self._cache:
+            if session is not None:
+                self._cache.set(session_id, session)
+            elif self._negative_cache_ttl:
+                self._cache.set(session_id, _MISS, ttl_seconds=self._negative_cache_ttl)
         return session
 
     async def update(self, session_id: str, updates: dict) -> None:
-        async def _op() -> None:
-            await self._storage.update_session(session_id, updates)
-
-        await self._breaker.run(lambda: with_retries(_op, self._retry_attempts, self._retry_backoff_ms))
+        session = await self._protected(self._storage.update_session, session_id, updates)
         if self._cache:
-            session = await self._storage.get_session(session_id)
-            if session:
+            # Cache the session as the storage stored it instead of re-reading it. Nothing applied (the session
+            # is gone, or an adapter that doesn't return it): drop the entry so the next get() reads storage.
+            if isinstance(session, MCPSession):
                 self._cache.set(session_id, session)
+            else:
+                self._cache.delete(session_id)
 
     async def delete(self, session_id: str) -> None:
-        async def _op() -> None:
-            await self._storage.delete_session(session_id)
-
-        await self._breaker.run(lambda: with_retries(_op, self._retry_attempts, self._retry_backoff_ms))
+        await self._protected(self._storage.delete_session, session_id)
         if self._cache:
             self._cache.delete(session_id)
 
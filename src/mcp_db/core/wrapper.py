@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import typing as t
 
-from .interceptor import ProtocolInterceptor
+from .interceptor import _INCOMING_SID_KEY, ProtocolInterceptor
 
 JSON = t.Dict[str, t.Any]
 
+_UNSET = object()
+
 
 class MCPStorageWrapper:
     """Wraps an MCP server-like object by intercepting messages at the transport boundary.
@@ -31,7 +33,10 @@ class MCPStorageWrapper:
             response = await self._server.handle_message(forwarded["_raw"])  # type: ignore[arg-type]
             return response
         response = await self._server.handle_message(forwarded)
-        session_id = self._interceptor._extract_session_id(forwarded, context)  # internal use
+        # Reuse the id handle_incoming resolved; popped so a reused context can't carry it to the next message
+        session_id = context.pop(_INCOMING_SID_KEY, _UNSET) if isinstance(context, dict) else _UNSET
+        if session_id is _UNSET:
+            session_id = self._interceptor._extract_session_id(forwarded, context)  # internal use
         if session_id:
             response = await self._interceptor.handle_outgoing(session_id, response)
         return response
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 from collections import deque
 from dataclasses import dataclass
+from itertools import islice
 from typing import Deque, Dict
 from uuid import uuid4
 
@@ -12,11 +13,15 @@ from .types import EventCallback, EventId, EventMessage, JSONRPCMessage, StreamI
 _logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class EventEntry:
     event_id: EventId
     stream_id: StreamId
+    # Held by reference (no copy, no re-serialization): replay hands the same object back,
+    # so callers must not mutate a message after storing it
     message: JSONRPCMessage
+    # Absolute position within its stream (0 for the first event ever stored), unaffected by eviction
+    position: int = 0
 
 
 class InMemoryEventStore(EventStore):
@@ -24,22 +29,25 @@ class InMemoryEventStore(EventStore):
         self._max_events_per_stream = max_events_per_stream
         self._streams: Dict[StreamId, Deque[EventEntry]] = {}
         self._event_index: Dict[EventId, EventEntry] = {}
+        # Events ever stored per stream; the deque holds the last len(deque) of them
+        self._stream_counts: Dict[StreamId, int] = {}
 
     async def store_event(self, stream_id: StreamId, message: JSONRPCMessage) -> EventId:
         event_id: EventId = str(uuid4())
-        entry = EventEntry(event_id=event_id, stream_id=stream_id, message=message)
+        position = self._stream_counts.get(stream_id, 0)
+        self._stream_counts[stream_id] = position + 1
+        entry = EventEntry(event_id=event_id, stream_id=stream_id, message=message, position=position)
 
-        if stream_id not in self._streams:
-            self._streams[stream_id] = deque(maxlen=self._max_events_per_stream)
-
-        stream_deque = self._streams[stream_id]
-        # If about to reach cap, preemptively remove oldest from index
-        if len(stream_deque) == self._max_events_per_stream and stream_deque:
-            oldest = stream_deque[0]
-            self._event_index.pop(oldest.event_id, None)
+        event_index = self._event_index
+        stream_deque = self._streams.get(stream_id)
+        if stream_deque is None:
+            stream_deque = self._streams[stream_id] = deque(maxlen=self._max_events_per_stream)
+        elif len(stream_deque) == stream_deque.maxlen and stream_deque:
+            # Full: the append below evicts the oldest entry, so drop it from the index
+            event_index.pop(stream_deque[0].event_id, None)
 
         stream_deque.append(entry)
-        self._event_index[event_id] = entry
+        event_index[event_id] = entry
         return event_id
 
     async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
@@ -53,11 +61,11 @@ class InMemoryEventStore(EventStore):
         if not stream_events:
             return stream_id
 
-        found_last = False
-        for entry in stream_events:
-            if found_last:
-                await send_callback(EventMessage(entry.message, entry.event_id))
-            elif entry.event_id == last_event_id:
-                found_last = True
+        # Locate the last event by position instead of scanning for its id. Snapshot the tail
+        # so events stored while replaying (the callback awaits) don't disturb the iteration.
+        first_position = self._stream_counts[stream_id] - len(stream_events)
+        start = last_entry.position - first_position + 1
+        for entry in list(islice(stream_events, start, None)):
+            await send_callback(EventMessage(entry.message, entry.event_id))
 
         return stream_id
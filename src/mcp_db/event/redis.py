@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import time
 from typing import Optional
 
@@ -9,11 +8,35 @@ from redis.asyncio import Redis
 from .base import EventStore
 from .types import EventCallback, EventId, EventMessage, JSONRPCMessage, StreamId
 
+# XADD + index HSET in one round-trip; the stream id generated by XADD is needed for the HSET
+_STORE_LUA = """
+local id = redis.call('XADD', KEYS[1], '*', 'message', ARGV[1], 'ts', ARGV[2])
+redis.call('HSET', KEYS[2], id, ARGV[3])
+return id
+"""
+
+# Index HGET + XRANGE in one round-trip. The stream key is derived from the looked-up stream id,
+# so it can't be declared in KEYS: this assumes a non-clustered Redis (or co-located keys).
+_REPLAY_LUA = """
+local stream_id = redis.call('HGET', KEYS[1], ARGV[1])
+if not stream_id then
+  return false
+end
+return {stream_id, redis.call('XRANGE', ARGV[2] .. stream_id, '(' .. ARGV[1], '+')}
+"""
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, (bytes, bytearray)) else str(value)
+
 
 class RedisEventStore(EventStore):
     def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "mcp") -> None:
         self._client = Redis.from_url(url)
         self._prefix = prefix
+        # Registered scripts run via EVALSHA, falling back to EVAL once if the server lacks them
+        self._store_script = self._client.register_script(_STORE_LUA)
+        self._replay_script = self._client.register_script(_REPLAY_LUA)
 
     def _stream_key(self, stream_id: StreamId) -> str:
         return f"{self._prefix}:events:{stream_id}"
@@ -22,28 +45,28 @@ class RedisEventStore(EventStore):
         return f"{self._prefix}:event_index"
 
     async def store_event(self, stream_id: StreamId, message: JSONRPCMessage) -> EventId:
-        message_dict = message.model_dump(by_alias=True, exclude_none=True)
-        payload = json.dumps(message_dict)
-        ts = int(time.time() * 1000)
-        fields = {"message": payload, "ts": str(ts)}
-        event_id: EventId = await self._client.xadd(self._stream_key(stream_id), fields)  # type: ignore
-        await self._client.hset(self._index_key(), event_id, stream_id)
-        return event_id
+        # Serialize straight to JSON bytes in pydantic-core, without an intermediate dict
+        payload = message.model_dump_json(by_alias=True, exclude_none=True)
+        ts = time.time_ns() // 1_000_000
+        event_id = await self._store_script(
+            keys=[self._stream_key(stream_id), self._index_key()], args=[payload, ts, stream_id]
+        )
+        return _decode(event_id)
 
     async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> StreamId | None:
-        stream_id: Optional[StreamId] = await self._client.hget(self._index_key(), last_event_id)  # type: ignore
-        if not stream_id:
-            return None
-        stream_id_str = stream_id.decode() if isinstance(stream_id, (bytes, bytearray)) else str(stream_id)
-        stream_key = self._stream_key(stream_id_str)
         # Start strictly after last_event_id per SSE semantics
-        rows = await self._client.xrange(stream_key, min=f"({last_event_id}", max="+")  # type: ignore
-        for eid, data in rows:
-            payload = data.get(b"message") if isinstance(data, dict) else data["message"]
-            msg_json = payload.decode() if isinstance(payload, (bytes, bytearray)) else payload
-            msg_dict = json.loads(msg_json)
-            message = JSONRPCMessage.model_validate(msg_dict)
-            await send_callback(
-                EventMessage(message, eid.decode() if isinstance(eid, (bytes, bytearray)) else str(eid))
-            )
-        return stream_id_str
+        result: Optional[list] = await self._replay_script(
+            keys=[self._index_key()], args=[last_event_id, self._stream_key("")]
+        )
+        if not result:
+            return None
+        stream_id, rows = result
+        for eid, fields in rows:
+            # Raw script replies carry stream entry fields as a flat [name, value, ...] list
+            payload = next((fields[i + 1] for i in range(0, len(fields), 2) if fields[i] == b"message"), None)
+            if payload is None:
+                continue
+            # Validate directly from the stored bytes; no str decode or intermediate dict
+            message = JSONRPCMessage.model_validate_json(payload)
+            await send_callback(EventMessage(message, _decode(eid)))
+        return _decode(stream_id)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 import typing as t
 from abc import ABC, abstractmethod
 
@@ -16,7 +17,10 @@ class StorageAdapter(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def update_session(self, session_id: str, updates: dict) -> None:  # pragma: no cover - interface
+    async def update_session(
+        self, session_id: str, updates: dict
+    ) -> t.Optional[MCPSession]:  # pragma: no cover - interface
+        """Apply `updates` and refresh `updated_at`; return the stored session, or None if it doesn't exist."""
         raise NotImplementedError
 
     @abstractmethod
@@ -64,12 +68,14 @@ class InMemoryStorage(StorageAdapter):
     async def get_session(self, session_id: str) -> t.Optional[MCPSession]:
         return self._sessions.get(session_id)
 
-    async def update_session(self, session_id: str, updates: dict) -> None:
+    async def update_session(self, session_id: str, updates: dict) -> t.Optional[MCPSession]:
         session = self._sessions.get(session_id)
         if not session:
-            return
+            return None
+        session.updated_at = time.time()
         for key, value in updates.items():
             setattr(session, key, value)
+        return session
 
     async def delete_session(self, session_id: str) -> None:
         self._sessions.pop(session_id, None)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import logging
+import time
 import typing as t
-from dataclasses import asdict
 
+from mcp_db.cache.local_cache import LocalCache
 from mcp_db.core.models import MCPEvent, MCPSession
+from mcp_db.utils.serialization import json_dumps, json_loads
 
 from .base import StorageAdapter
 
@@ -18,13 +21,119 @@ except Exception:  # pragma: no cover - optional dependency
     except Exception:
         _redis_lib = None
 
+_logger = logging.getLogger(__name__)
+
+# Compare-and-set for session updates: write ARGV[2] only if the key still holds ARGV[1] (the value
+# the update was merged into). Returns 1 when written, nil if the session is gone, else the current
+# value so the caller can re-merge without another GET. Encoding stays client-side, so any codec works.
+_UPDATE_LUA = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+  return false
+end
+if current == ARGV[1] then
+  redis.call('SET', KEYS[1], ARGV[2], 'KEEPTTL')
+  return 1
+end
+return current
+"""
+
+# Entries per XRANGE page when reading event history: large pages amortize round trips and framing
+_EVENTS_PAGE_SIZE = 1000
+# Upper bound, in seconds, of the backoff between retries of a failed background flush
+_FLUSH_RETRY_MAX_DELAY = 1.0
+
+# Stream entry field holding the encoded event (the event id lives inside it and in the index).
+# Streams store field names with every entry, so it is kept to one byte.
+_EVENT_FIELD = b"e"
+# Fields of entries written by earlier versions: the event, plus a copy of its id
+_LEGACY_EVENT_FIELD = b"event"
+_LEGACY_EVENT_ID_FIELD = b"event_id"
+
+# XADD + event id index HSET in one round trip; the HSET needs the stream id XADD generates.
+# ARGV: encoded event, event id, MAXLEN ('' for an untrimmed stream). The field is _EVENT_FIELD.
+# On trimmed streams the index would keep ids of evicted entries forever, so once it holds more
+# than twice as many ids as the stream has entries, ids older than the first entry are pruned:
+# at least half the index is dropped per prune, which keeps the cost amortized O(1) per append.
+_APPEND_LUA = """
+-- Idempotent per event id: a batch resent after an ambiguous pipeline failure doesn't duplicate entries
+local id = redis.call('HGET', KEYS[2], ARGV[2])
+if id then
+  return id
+end
+if ARGV[3] ~= '' then
+  id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[3], '*', 'e', ARGV[1])
+else
+  id = redis.call('XADD', KEYS[1], '*', 'e', ARGV[1])
+end
+redis.call('HSET', KEYS[2], ARGV[2], id)
+if ARGV[3] ~= '' and redis.call('HLEN', KEYS[2]) > 2 * redis.call('XLEN', KEYS[1]) then
+  local first = redis.call('XRANGE', KEYS[1], '-', '+', 'COUNT', 1)[1][1]
+  local first_ms, first_seq = string.match(first, '(%d+)-(%d+)')
+  first_ms, first_seq = tonumber(first_ms), tonumber(first_seq)
+  local flat = redis.call('HGETALL', KEYS[2])
+  local stale = {}
+  for i = 1, #flat, 2 do
+    local ms, seq = string.match(flat[i + 1], '(%d+)-(%d+)')
+    ms, seq = tonumber(ms), tonumber(seq)
+    if ms < first_ms or (ms == first_ms and seq < first_seq) then
+      stale[#stale + 1] = flat[i]
+    end
+  end
+  -- HDEL in bounded chunks: unpack() is limited by the Lua stack size
+  for i = 1, #stale, 1000 do
+    redis.call('HDEL', KEYS[2], unpack(stale, i, math.min(i + 999, #stale)))
+  end
+end
+return id
+"""
+
+T = t.TypeVar("T")
+
+
+class Codec(t.Protocol):
+    """What `RedisStorage` needs from a codec: dataclass to bytes, and bytes back into a given dataclass type."""
+
+    def encode(self, obj: t.Any) -> bytes: ...
+
+    def decode(self, data: bytes, cls: t.Type[T]) -> T: ...
+
+
+class JSONCodec:
+    """Default codec: sessions and events as compact JSON (orjson when installed).
+
+    A codec encodes a session/event dataclass to bytes and decodes bytes back into a
+    given dataclass type. Pass another object with the same two methods (any `Codec`,
+    e.g. a msgpack codec) to `RedisStorage(codec=...)` to change the stored format.
+    """
+
+    def encode(self, obj: t.Any) -> bytes:
+        # Dataclasses are encoded field by field; no asdict() deep copy
+        return json_dumps(obj)
+
+    def decode(self, data: bytes, cls: t.Type[T]) -> T:
+        return cls(**json_loads(data))
+
 
 class RedisStorage(StorageAdapter):
     """Redis-backed storage adapter.
 
-    - Sessions are stored as JSON strings at key: `{prefix}:session:{id}`
-    - Events are stored in Redis Streams at key: `{prefix}:events:{session_id}`
+    - Sessions are stored as encoded bytes (JSON by default, see `JSONCodec`) at key: `{prefix}:session:{id}`
+    - Events are stored in Redis Streams at key: `{prefix}:events:{session_id}`, with an
+      event id -> stream id index hash at `{prefix}:eventidx:{session_id}` for resuming reads.
+      With `stream_maxlen` the index is pruned of trimmed entries as it grows, so it stays
+      within about twice the stream's length; resuming after a trimmed event replays from the
+      start of what is retained.
     - Locks use `SET NX PX` with key: `{prefix}:lock:{key}`
+
+    With `short_keys=True` the kinds are abbreviated (`{prefix}:s:`, `:e:`, `:i:`, `:l:`) to save
+    memory and bytes on the wire for every key. The layouts are not interchangeable: pick one per
+    deployment.
+
+    With `event_batch_size` set, `append_event` buffers events and writes them in one pipelined
+    XADD burst once the batch is full or `event_flush_interval_ms` has passed, whichever comes
+    first. Buffered events are not yet durable: call `flush()` where that matters (`get_events`
+    and `close()` flush first).
     """
 
     def __init__(
@@ -33,101 +142,234 @@ class RedisStorage(StorageAdapter):
         *,
         prefix: str = "mcp",
         stream_maxlen: int | None = None,
+        codec: t.Optional[Codec] = None,
+        event_batch_size: int | None = None,
+        event_flush_interval_ms: float = 5.0,
+        short_keys: bool = False,
+        session_cache_size: int = 1000,
+        session_cache_ttl_seconds: float = 60.0,
+        max_connections: int | None = None,
+        pool_timeout: float | None = None,
     ) -> None:
         if _redis_lib is None:  # pragma: no cover
             raise ImportError("Redis asyncio client is required. Install with: pip install redis (or aioredis)")
         self._url = url
         self._prefix = prefix.rstrip(":")
+        # Key prefixes built once; keys are then a single concatenation per call
+        session_kind, events_kind, index_kind, lock_kind = (
+            ("s", "e", "i", "l") if short_keys else ("session", "events", "eventidx", "lock")
+        )
+        self._session_pfx = f"{self._prefix}:{session_kind}:"
+        self._events_pfx = f"{self._prefix}:{events_kind}:"
+        self._index_pfx = f"{self._prefix}:{index_kind}:"
+        self._lock_pfx = f"{self._prefix}:{lock_kind}:"
         self._stream_maxlen = stream_maxlen
-        # Both redis.asyncio and aioredis expose from_url
-        self._redis = _redis_lib.from_url(url, decode_responses=True)
+        self._codec = codec or JSONCodec()
+        # Last known stored bytes per session (0 disables). Only used as the expected value of the
+        # compare-and-set in update_session, so a stale entry costs a retry, never a lost write.
+        self._raw_cache = (
+            LocalCache(max_size=session_cache_size, ttl_seconds=session_cache_ttl_seconds)
+            if session_cache_size > 0
+            else None
+        )
+        # XADD options shared by direct and pipelined appends
+        # Event batching (off by default): buffered (stream key, entry) pairs in append order
+        self._batch_size = event_batch_size
+        self._flush_interval = event_flush_interval_ms / 1000.0
+        self._pending: t.List[t.Tuple[t.List[str], t.List[t.Any]]] = []
+        self._flush_task: t.Optional[asyncio.Task[None]] = None
+        # Serializes flushes so bursts reach each stream in append order
+        self._flush_lock = asyncio.Lock()
+        # Raw bytes in and out: values are handed to the codec without a UTF-8 decode/encode round trip.
+        # The client parses replies with hiredis (C) when it is installed: pip install "mcp-db[hiredis]"
+        self._pool: t.Any = None
+        if max_connections is not None:
+            # Bounded pool: callers wait up to `pool_timeout` seconds for a free connection instead of
+            # opening new ones without limit under load. Unset keeps redis-py's finite default wait.
+            pool_kwargs: t.Dict[str, t.Any] = {} if pool_timeout is None else {"timeout": pool_timeout}
+            self._pool = _redis_lib.BlockingConnectionPool.from_url(
+                url, max_connections=max_connections, decode_responses=False, **pool_kwargs
+            )
+            self._redis = _redis_lib.Redis(connection_pool=self._pool)
+        else:
+            # Both redis.asyncio and aioredis expose from_url
+            self._redis = _redis_lib.from_url(url, decode_responses=False)
+        # Run via EVALSHA, falling back to EVAL once if the server lacks the script
+        self._append_script = self._redis.register_script(_APPEND_LUA)
+        self._update_script = self._redis.register_script(_UPDATE_LUA)
 
     def _session_key(self, session_id: str) -> str:
-        return f"{self._prefix}:session:{session_id}"
+        return self._session_pfx + session_id
 
     def _events_key(self, session_id: str) -> str:
-        return f"{self._prefix}:events:{session_id}"
+        return self._events_pfx + session_id
+
+    def _index_key(self, session_id: str) -> str:
+        return self._index_pfx + session_id
 
     def _lock_key(self, key: str) -> str:
-        return f"{self._prefix}:lock:{key}"
+        return self._lock_pfx + key
 
     async def create_session(self, session: MCPSession) -> None:
-        payload = json.dumps(asdict(session))
-        await self._redis.set(self._session_key(session.id), payload)
+        raw = self._codec.encode(session)
+        await self._redis.set(self._session_key(session.id), raw)
+        if self._raw_cache is not None:
+            self._raw_cache.set(session.id, raw)
 
     async def get_session(self, session_id: str) -> t.Optional[MCPSession]:
+        # Always read storage: other nodes may have changed the session
         raw = await self._redis.get(self._session_key(session_id))
         if raw is None:
             return None
-        data = json.loads(raw)
-        return MCPSession(**data)
+        if self._raw_cache is not None:
+            self._raw_cache.set(session_id, raw)
+        return self._codec.decode(raw, MCPSession)
 
-    async def update_session(self, session_id: str, updates: dict) -> None:
+    async def update_session(self, session_id: str, updates: dict) -> t.Optional[MCPSession]:
         key = self._session_key(session_id)
-        raw = await self._redis.get(key)
+        cache = self._raw_cache
+        # The last known bytes skip the GET; if they're stale the script hands back the current value
+        raw = cache.get(session_id) if cache is not None else None
         if raw is None:
-            return
-        data = json.loads(raw)
-        data.update(updates)
-        await self._redis.set(key, json.dumps(data))
+            raw = await self._redis.get(key)
+        # Merge and compare-and-set; a concurrent writer makes the script return its value to merge into
+        while isinstance(raw, bytes):
+            session = self._codec.decode(raw, MCPSession)
+            session.updated_at = time.time()
+            for field_name, value in updates.items():
+                setattr(session, field_name, value)
+            new_raw = self._codec.encode(session)
+            result = await self._update_script(keys=[key], args=[raw, new_raw])
+            if result == 1:
+                if cache is not None:
+                    cache.set(session_id, new_raw)
+                return session
+            raw = result
+        # Session is gone
+        if cache is not None:
+            cache.delete(session_id)
+        return None
 
     async def delete_session(self, session_id: str) -> None:
-        await self._redis.delete(self._session_key(session_id))
-        await self._redis.delete(self._events_key(session_id))
+        if self._raw_cache is not None:
+            self._raw_cache.delete(session_id)
+        # One multi-key DEL: a single command and round trip for the session, its stream and index
+        await self._redis.delete(
+            self._session_key(session_id), self._events_key(session_id), self._index_key(session_id)
+        )
 
     async def append_event(self, event: MCPEvent) -> None:
-        key = self._events_key(event.session_id)
-        entry = {
-            "event": json.dumps(asdict(event)),
-            "event_id": event.event_id,
-        }
-        # Ensure stream key exists by creating the session stream bucket if needed
-        if self._stream_maxlen is not None:
-            await self._redis.xadd(key, entry, maxlen=self._stream_maxlen, approximate=True)
-        else:
-            await self._redis.xadd(key, entry)
+        keys = [self._events_key(event.session_id), self._index_key(event.session_id)]
+        maxlen = "" if self._stream_maxlen is None else self._stream_maxlen
+        args = [self._codec.encode(event), event.event_id, maxlen]
+        if self._batch_size is None:
+            # XADD creates the session stream on first append
+            await self._append_script(keys=keys, args=args)
+            return
+        self._pending.append((keys, args))
+        if len(self._pending) >= self._batch_size:
+            try:
+                await self.flush()
+            except Exception:
+                # The batch stays buffered: retry in the background rather than waiting for the next append
+                if self._flush_task is None or self._flush_task.done():
+                    self._schedule_flush(self._flush_interval)
+                raise
+        elif self._flush_task is None or self._flush_task.done():
+            self._schedule_flush(self._flush_interval)
+
+    def _schedule_flush(self, delay: float) -> None:
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            await self.flush()
+        except Exception:
+            _logger.exception("Failed to flush buffered events to Redis")
+            if self._pending:
+                # Retry with exponential backoff until Redis accepts the batch
+                self._schedule_flush(min(max(delay, self._flush_interval) * 2, _FLUSH_RETRY_MAX_DELAY))
+
+    async def flush(self) -> None:
+        """Write buffered events (see `event_batch_size`) in a single pipelined round trip."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            sent = False
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for keys, args in pending:
+                    # Queues EVALSHA on the pipeline (the pipeline loads the script if the server lacks it)
+                    await self._append_script(keys=keys, args=args, client=pipe)
+                sent = True
+                await pipe.execute()
+            except asyncio.CancelledError:
+                # Cancelled once the commands may be on the wire: the batch is not queued again
+                if not sent:
+                    self._pending[:0] = pending
+                raise
+            except Exception:
+                # Requeue ahead of anything buffered meanwhile so the next flush retries in order. A failed
+                # execute() may have applied part of the batch; the append script skips event ids already
+                # indexed, so the resend doesn't duplicate them.
+                self._pending[:0] = pending
+                raise
 
     async def get_events(self, session_id: str, after_event_id: t.Optional[str] = None) -> t.AsyncIterator[MCPEvent]:
+        if self._pending:
+            # Read our own buffered writes
+            await self.flush()
         key = self._events_key(session_id)
         start = "-"
         if after_event_id is not None:
-            # We need to find the first entry after an event with matching event_id field.
-            # Since Redis Streams query by stream IDs, we scan forward and filter by our event_id field.
-            # For simplicity, do a range and filter in memory in batches.
-            last_id = "-"
-            # Initial scan to locate the stream ID after the target event_id
-            while True:
-                entries = await self._redis.xrange(key, min=last_id, max="+", count=100)
-                if not entries:
-                    break
-                for sid, fields in entries:
-                    if fields.get("event_id") == after_event_id:
-                        start = sid  # start from this stream id
-                        break
-                if start != "-" and start != last_id:
-                    break
-                last_id = entries[-1][0]
-            # Begin from the next stream id strictly after the found one
-            if start != "-":
-                # Redis streams use `(id` syntax to mean exclusive
-                start = f"({start}"
+            found = await self._redis.hget(self._index_key(session_id), after_event_id)
+            if found is None:
+                # Streams written before the index existed: locate the event by scanning
+                found = await self._scan_for_event(key, after_event_id)
+            if found is not None:
+                # Begin strictly after the found entry (`(id` is an exclusive bound)
+                start = f"({found.decode()}"
 
         # Stream forward from `start`
         last = start
         while True:
-            entries = await self._redis.xrange(key, min=last, max="+", count=100)
+            entries = await self._redis.xrange(key, min=last, max="+", count=_EVENTS_PAGE_SIZE)
             if not entries:
                 break
             for sid, fields in entries:
-                data_raw = fields.get("event")
+                data_raw = fields.get(_EVENT_FIELD) or fields.get(_LEGACY_EVENT_FIELD)
                 if not data_raw:
                     continue
-                data = json.loads(data_raw)
-                # Ensure event_id is set (prefer stored value)
-                data["event_id"] = fields.get("event_id", data.get("event_id", sid))
-                # Coerce to dataclass
-                yield MCPEvent(**data)
-            last = entries[-1][0]
+                event = self._codec.decode(data_raw, MCPEvent)
+                # Legacy entries carry the id separately; prefer it as before
+                stored_id = fields.get(_LEGACY_EVENT_ID_FIELD)
+                if stored_id:
+                    event.event_id = stored_id.decode()
+                elif not event.event_id:
+                    event.event_id = sid.decode()
+                yield event
+            if len(entries) < _EVENTS_PAGE_SIZE:
+                # Short page: the end of the stream, no need for a final empty XRANGE
+                break
+            last = f"({entries[-1][0].decode()}"
+
+    async def _scan_for_event(self, key: str, event_id: str) -> t.Optional[bytes]:
+        """Return the stream id of the legacy entry whose event_id field is `event_id`, scanning in pages.
+
+        Only entries written before the event id index existed need this; they all carry the field.
+        """
+        target = event_id.encode()
+        last_id = "-"
+        while True:
+            entries = await self._redis.xrange(key, min=last_id, max="+", count=_EVENTS_PAGE_SIZE)
+            for sid, fields in entries:
+                if fields.get(_LEGACY_EVENT_ID_FIELD) == target:
+                    return sid
+            if len(entries) < _EVENTS_PAGE_SIZE:
+                return None
+            last_id = f"({entries[-1][0].decode()}"
 
     async def acquire_lock(self, key: str, ttl_seconds: float) -> bool:
         ttl_ms = int(ttl_seconds * 1000)
@@ -145,7 +387,16 @@ class RedisStorage(StorageAdapter):
             return False
 
     async def close(self) -> None:  # pragma: no cover - convenience
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        try:
+            await self.flush()
+        except Exception:
+            _logger.exception("Failed to flush buffered events to Redis")
         try:
             await self._redis.close()
+            if self._pool is not None:
+                # A client built on an explicit pool doesn't disconnect it on close
+                await self._pool.disconnect()
         except Exception:
             pass
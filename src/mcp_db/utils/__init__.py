@@ -1,10 +1,16 @@
-"""Utility module for resilience patterns."""
+"""Utility module for resilience patterns and serialization helpers."""
 
+from .eventloop import install_uvloop, preferred_loop
 from .resilience import CircuitBreaker, CircuitBreakerConfig, CircuitState, with_retries
+from .serialization import json_dumps, json_loads
 
 __all__ = [
     "CircuitBreaker",
     "CircuitBreakerConfig",
     "CircuitState",
     "with_retries",
+    "json_dumps",
+    "json_loads",
+    "install_uvloop",
+    "preferred_loop",
 ]
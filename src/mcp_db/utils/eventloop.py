@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+
+
+def uvloop_available() -> bool:
+    """Return True if uvloop can be imported (it is optional and unavailable on Windows)."""
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def preferred_loop() -> str:
+    """Return the event loop name to pass to servers such as uvicorn: "uvloop" when installed, else "asyncio"."""
+    return "uvloop" if uvloop_available() else "asyncio"
+
+
+def install_uvloop() -> bool:
+    """Make uvloop the event loop for subsequently created loops, if it is installed.
+
+    Call it from the application entry point before the loop starts; the library never
+    changes the global loop policy on import. Returns whether uvloop was installed.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    if sys.version_info >= (3, 12):
+        # uvloop.install() is deprecated on 3.12+; setting the policy is equivalent
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    else:
+        uvloop.install()
+    return True
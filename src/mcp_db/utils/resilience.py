@@ -27,11 +27,13 @@ class CircuitBreaker:
         self._failures = 0
         self._opened_at = 0.0
 
-    def _can_attempt(self) -> bool:
+    # allow_request/record_success/record_failure are public so callers with their own retry loop
+    # can guard a call without wrapping it in a closure for run()
+    def allow_request(self) -> bool:
         if self._state == CircuitState.CLOSED:
             return True
         if self._state == CircuitState.OPEN:
-            if (time.time() - self._opened_at) >= self._config.reset_timeout_seconds:
+            if (time.monotonic() - self._opened_at) >= self._config.reset_timeout_seconds:
                 self._state = CircuitState.HALF_OPEN
                 return True
             return False
@@ -39,26 +41,26 @@ class CircuitBreaker:
             return True
         return True
 
-    def _on_success(self) -> None:
+    def record_success(self) -> None:
         self._state = CircuitState.CLOSED
         self._failures = 0
 
-    def _on_failure(self) -> None:
+    def record_failure(self) -> None:
         self._failures += 1
         if self._failures >= self._config.failure_threshold:
             self._state = CircuitState.OPEN
-            self._opened_at = time.time()
+            self._opened_at = time.monotonic()
 
     async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
-        if not self._can_attempt():
+        if not self.allow_request():
             raise RuntimeError("circuit_open")
         try:
             result = await fn()
         except Exception:
-            self._on_failure()
+            self.record_failure()
             raise
         else:
-            self._on_success()
+            self.record_success()
             return result
 
 
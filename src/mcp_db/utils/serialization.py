@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import re
+import typing as t
+
+import anyio
+
+# Prefer orjson (optional speedup) and fall back to the stdlib json module
+_orjson: t.Any | None = None
+try:
+    import orjson as _orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    _orjson = None
+
+
+JSONInput = t.Union[bytes, bytearray, memoryview, str]
+
+# Payloads above this size are parsed off the event loop by `json_loads_async`
+OFFLOAD_THRESHOLD_BYTES = 64 * 1024
+
+
+def json_loads(data: JSONInput) -> t.Any:
+    """Decode JSON from bytes or str."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _default(obj: t.Any) -> t.Any:
+    # Dataclass instances encode as their fields (as orjson does natively), without an asdict() deep copy
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj: t.Any) -> bytes:
+    """Encode `obj` as compact UTF-8 JSON bytes; dataclass instances are encoded as objects."""
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+
+async def json_loads_async(data: JSONInput, offload_threshold: int = OFFLOAD_THRESHOLD_BYTES) -> t.Any:
+    """Decode JSON like `json_loads`, parsing large payloads in a worker thread.
+
+    Small messages are parsed inline; a multi-megabyte one (e.g. a large tool
+    result) would otherwise stall every other task on the event loop while it parses.
+    """
+    if len(data) > offload_threshold:
+        return await anyio.to_thread.run_sync(json_loads, data)
+    return json_loads(data)
+
+
+_METHOD_RE = re.compile(rb'"method"\s*:\s*"([^"\\]*)"')
+
+
+def peek_jsonrpc_method(body: bytes) -> t.Optional[str]:
+    """Return the top-level JSON-RPC method of `body` without fully parsing it where possible.
+
+    The regex fast path is only trusted when no object or array opens between the frame's
+    opening brace and the match, i.e. the key can't be nested in `params`/`result`.
+    """
+    match = _METHOD_RE.search(body)
+    if match is not None:
+        opening = body.find(b"{")
+        end = match.start()
+        if opening != -1 and body.find(b"{", opening + 1, end) == -1 and body.find(b"[", opening + 1, end) == -1:
+            return match.group(1).decode("utf-8", errors="replace")
+    elif b'"method"' not in body:
+        return None
+    # Possibly nested key, or escaped characters in the method name: fall back to a real parse
+    try:
+        payload = json_loads(body)
+    except ValueError:
+        return None
+    return payload.get("method") if isinstance(payload, dict) else None
+
+
+_OBJECT_START_RE = re.compile(rb"\s*\{")
+# Top-level id of a JSON-RPC frame when it leads the object (optionally after "jsonrpc"), as serializers emit it
+_ID_RE = re.compile(rb'\s*\{\s*(?:"jsonrpc"\s*:\s*"2\.0"\s*,\s*)?"id"\s*:\s*(-?\d+|"[^"\\]*")')
+
+
+def peek_jsonrpc_fields(data: bytes) -> t.Optional[t.Dict[str, t.Any]]:
+    """Return the routing fields (jsonrpc, id, method) of a JSON-RPC frame without a full parse.
+
+    Returns None for data that isn't a JSON object. The id is only reported when it
+    leads the object; otherwise it is omitted rather than risk matching a nested one.
+    """
+    if _OBJECT_START_RE.match(data) is None:
+        return None
+    fields: t.Dict[str, t.Any] = {"jsonrpc": "2.0"}
+    match = _ID_RE.match(data)
+    if match is not None:
+        fields["id"] = json_loads(match.group(1))
+    method = peek_jsonrpc_method(data)
+    if method is not None:
+        fields["method"] = method
+    return fields
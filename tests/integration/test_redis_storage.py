@@ -0,0 +1,48 @@
+"""Integration tests for RedisStorage against a live Redis (skipped when none is reachable)."""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from mcp_db.core.models import BaseEvent
+from mcp_db.session.redis_adapter import RedisStorage
+
+
+@pytest_asyncio.fixture
+async def storage():
+    """RedisStorage on a scratch prefix in db 15, with a short trimmed stream."""
+    store = RedisStorage(url="redis://localhost:6379/15", prefix=f"test_mcp_{uuid.uuid4().hex[:8]}", stream_maxlen=10)
+    if not await store.is_healthy():
+        pytest.skip("Redis not available")
+    yield store
+    await store.delete_session("s")
+    await store.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.requires_redis
+async def test_event_index_bounded_with_trimmed_stream(storage):
+    """Test the event id index is pruned along with the trimmed stream and still resumes."""
+    for i in range(500):
+        await storage.append_event(BaseEvent(event_id=f"e{i}", session_id="s", event_type="T"))
+
+    stream_len = await storage._redis.xlen(storage._events_key("s"))
+    index = await storage._redis.hgetall(storage._index_key("s"))
+    assert len(index) <= 2 * stream_len
+    retained = [sid for sid, _ in await storage._redis.xrange(storage._events_key("s"))]
+    assert set(retained) <= set(index.values())
+
+    events = [ev.event_id async for ev in storage.get_events("s", after_event_id="e497")]
+    assert events == ["e498", "e499"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.requires_redis
+async def test_resent_event_is_not_duplicated(storage):
+    """Test appending an already indexed event id (a resent batch) leaves one stream entry."""
+    event = BaseEvent(event_id="e1", session_id="s", event_type="T")
+    await storage.append_event(event)
+    await storage.append_event(event)
+
+    assert await storage._redis.xlen(storage._events_key("s")) == 1
@@ -1,5 +1,6 @@
 """Unit tests for LocalCache."""
 
+import threading
 import time
 
 from mcp_db.cache.local_cache import LocalCache
@@ -88,6 +89,21 @@ class TestLocalCache:
         assert cache.get("key3") == "value3"  # Still there
         assert cache.get("key4") == "value4"  # New item
 
+    def test_no_touch_on_get_evicts_in_insertion_order(self):
+        """Test that hits don't refresh recency when touch_on_get is disabled."""
+        cache = LocalCache(max_size=2, ttl_seconds=60, touch_on_get=False)
+
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        assert cache.get("key1") == "value1"
+
+        # key1 is still oldest despite the hit
+        cache.set("key3", "value3")
+
+        assert cache.get("key1") is None
+        assert cache.get("key2") == "value2"
+        assert cache.get("key3") == "value3"
+
     def test_ttl_expiration(self):
         """Test TTL expiration of cached items."""
         cache = LocalCache(max_size=10, ttl_seconds=0.1)  # 100ms TTL
@@ -144,3 +160,50 @@ class TestLocalCache:
         # Verify some samples
         assert large_cache.get("key0") == "value0"
         assert large_cache.get("key999") == "value999"
+
+    def test_expired_entries_evicted_before_lru(self):
+        """Test that a full cache drops expired entries before live LRU ones."""
+        cache = LocalCache(max_size=2, ttl_seconds=60)
+
+        cache.set("live", "value1")
+        cache.set("short", "value2", ttl_seconds=0.05)
+        time.sleep(0.1)
+
+        # Over capacity: the expired entry goes, the older live entry stays
+        cache.set("new", "value3")
+
+        assert cache.get("live") == "value1"
+        assert cache.get("new") == "value3"
+        assert cache.get("short") is None
+
+    def test_expiry_heap_stays_bounded(self):
+        """Test that repeated overwrites do not grow expiry bookkeeping without bound."""
+        cache = LocalCache(max_size=5, ttl_seconds=60)
+
+        for i in range(1000):
+            cache.set("hot", i)
+
+        assert cache.get("hot") == 999
+        assert len(cache._expiry_heap) <= 2 * 5 + 1
+
+    def test_concurrent_threads(self):
+        """Test concurrent set/get from multiple threads."""
+        cache = LocalCache(max_size=50, ttl_seconds=60)
+        errors = []
+
+        def worker(n: int) -> None:
+            try:
+                for i in range(500):
+                    cache.set(f"k{n}-{i % 80}", i)
+                    cache.get(f"k{n}-{(i * 7) % 80}")
+            except Exception as exc:  # pragma: no cover - failure path
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+
+        assert errors == []
+        assert len(cache._store) <= 50
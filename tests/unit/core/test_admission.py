@@ -1,7 +1,9 @@
 """Unit tests for StreamableHTTPAdmissionController."""
 
+import contextlib
 from unittest.mock import Mock
 
+import anyio
 import pytest
 
 from mcp_db.core.admission import StreamableHTTPAdmissionController
@@ -77,3 +79,51 @@ class TestStreamableHTTPAdmissionController:
         await controller.ensure_session_transport("error-sess")
 
         # No exception raised is success
+
+    async def test_transport_kwargs_follow_constructor_signature(self, monkeypatch, mock_session_manager, mock_mcp_app):
+        """Test transport kwargs are derived from the constructor signature once at init."""
+
+        class LegacyTransport:
+            def __init__(self, mcp_session_id, json_response=False, event_store=None):
+                self.mcp_session_id = mcp_session_id
+                self.json_response = json_response
+                self.event_store = event_store
+
+        monkeypatch.setattr("mcp_db.core.admission._resolve_transport_class", lambda: LegacyTransport)
+        mock_session_manager._server_instances = {}
+        mock_session_manager.json_response = True
+        mock_session_manager._task_group = None
+
+        controller = StreamableHTTPAdmissionController(manager=mock_session_manager, app=mock_mcp_app)
+
+        assert controller._transport_kwargs == {"json_response": True, "event_store": mock_session_manager.event_store}
+
+        await controller.ensure_session_transport("legacy-sess")
+
+        transport = mock_session_manager._server_instances["legacy-sess"]
+        assert isinstance(transport, LegacyTransport)
+        assert transport.json_response is True
+
+    async def test_ensure_session_transport_uses_own_task_group(self, monkeypatch, mock_session_manager, mock_mcp_app):
+        """Test transports start on the controller's task group when the manager has none."""
+
+        class FakeTransport:
+            def __init__(self, mcp_session_id, **kwargs):
+                self.mcp_session_id = mcp_session_id
+
+            @contextlib.asynccontextmanager
+            async def connect(self):
+                yield (Mock(), Mock())
+
+        monkeypatch.setattr("mcp_db.core.admission._resolve_transport_class", lambda: FakeTransport)
+        mock_session_manager._server_instances = {}
+        mock_session_manager._task_group = None
+
+        controller = StreamableHTTPAdmissionController(manager=mock_session_manager, app=mock_mcp_app)
+
+        async with controller.run():
+            await controller.ensure_session_transport("bg-sess")
+            await anyio.wait_all_tasks_blocked()
+
+        assert "bg-sess" in mock_session_manager._server_instances
+        mock_mcp_app.run.assert_awaited_once()
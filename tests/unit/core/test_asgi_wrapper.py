@@ -1,11 +1,23 @@
 """Unit tests for ASGITransportWrapper."""
 
+import asyncio
 import json
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from mcp_db.core.asgi_wrapper import ASGITransportWrapper
+from mcp_db.core.asgi_wrapper import (
+    _MODE_JSON,
+    _MODE_SKIP,
+    _MODE_SSE,
+    ASGITransportWrapper,
+    _LazyHeaders,
+    _response_mode,
+    _scan_response_headers,
+    _SSEDataDecoder,
+)
+from mcp_db.core.interceptor import ProtocolInterceptor
+from mcp_db.core.models import MCPSession, SessionStatus
 
 
 @pytest.mark.asyncio
@@ -49,7 +61,66 @@ class TestASGITransportWrapper:
         # Should call interceptor exactly once
         mock_interceptor.handle_incoming.assert_called_once()
         call_args = mock_interceptor.handle_incoming.call_args[0]
-        assert call_args[0] == request_body
+        assert call_args[0] == request_body.encode()
+
+    async def test_request_headers_not_decoded_in_full(self, mock_session_manager, mock_asgi_app, http_scope):
+        """Test a tracked request and its response read headers by lookup, never decoding the whole list."""
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        wrapped_app = ASGITransportWrapper(interceptor).wrap(mock_asgi_app)
+        body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/list"}).encode()
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        with patch.object(_LazyHeaders, "_decoded", side_effect=AssertionError("decoded all headers")) as decoded:
+            await wrapped_app(http_scope, receive, AsyncMock())
+
+        decoded.assert_not_called()
+        assert mock_session_manager.append_event.await_count == 2
+
+    async def test_custom_json_encoder(self, mock_interceptor, http_scope):
+        """Test that the forwarded body is re-encoded with the configured json_encoder."""
+        encoded = []
+
+        def encoder(obj):
+            encoded.append(obj)
+            return b'{"encoded":true}'
+
+        received = []
+
+        async def inner_app(scope, receive, send):
+            received.append(await receive())
+
+        wrapper = ASGITransportWrapper(mock_interceptor, json_encoder=encoder)
+        wrapped_app = wrapper.wrap(inner_app)
+
+        async def receive():
+            return {"type": "http.request", "body": b'{"jsonrpc": "2.0", "method": "test"}', "more_body": False}
+
+        await wrapped_app(http_scope, receive, AsyncMock())
+
+        assert encoded == [{"jsonrpc": "2.0"}]
+        assert received[0]["body"] == b'{"encoded":true}'
+
+    async def test_unchanged_body_not_reencoded(self, mock_interceptor, http_scope):
+        """Test the original bytes are forwarded when the interceptor doesn't rewrite messages."""
+        mock_interceptor.rewrites_messages = False
+        encoder = Mock(return_value=b"{}")
+        received = []
+
+        async def inner_app(scope, receive, send):
+            received.append(await receive())
+
+        wrapped_app = ASGITransportWrapper(mock_interceptor, json_encoder=encoder).wrap(inner_app)
+        body = b'{"jsonrpc": "2.0",  "method": "test"}'
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await wrapped_app(http_scope, receive, AsyncMock())
+
+        encoder.assert_not_called()
+        assert received[0]["body"] is body
 
     async def test_invalid_json_preservation(self, mock_interceptor, mock_asgi_app, http_scope):
         """Test that invalid JSON is preserved with _raw path."""
@@ -72,6 +143,66 @@ class TestASGITransportWrapper:
         # Should preserve original bytes
         mock_interceptor.handle_incoming.assert_called_once()
 
+    async def test_routing_fields_only_when_full_payload_not_needed(self, mock_interceptor, http_scope):
+        """Test responses are peeked rather than parsed when the interceptor opts out of full payloads."""
+        mock_interceptor.needs_full_payload = False
+        mock_interceptor.extract_session_id = Mock(return_value="sid-1")
+        wrapper = ASGITransportWrapper(mock_interceptor)
+
+        async def inner_app(scope, receive, send):
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]}
+            )
+            await send({"type": "http.response.body", "body": b'{"jsonrpc":"2.0","id":1,"result":{"big":[1,2,3]}}'})
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        await wrapper.wrap(inner_app)(http_scope, receive, AsyncMock())
+
+        mock_interceptor.handle_outgoing.assert_awaited_once()
+        assert mock_interceptor.handle_outgoing.call_args[0][1] == {"jsonrpc": "2.0", "id": 1}
+
+    async def test_oversized_response_passed_raw(self, mock_interceptor, http_scope):
+        """Test responses above the interceptor's raw threshold reach it as unparsed bytes."""
+        mock_interceptor.raw_response_threshold = 32
+        mock_interceptor.extract_session_id = Mock(return_value="sid-1")
+        wrapper = ASGITransportWrapper(mock_interceptor)
+        small = b'{"id":1,"result":{}}'
+        large = b'{"jsonrpc":"2.0","id":2,"result":{"text":"' + b"x" * 64 + b'"}}'
+
+        async def inner_app(scope, receive, send):
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/event-stream")]}
+            )
+            await send({"type": "http.response.body", "body": b"data: " + small + b"\n\ndata: " + large + b"\n\n"})
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        await wrapper.wrap(inner_app)(http_scope, receive, AsyncMock())
+
+        responses = [call[0][1] for call in mock_interceptor.handle_outgoing.call_args_list]
+        assert responses == [json.loads(small), large]
+
+    async def test_non_json_body_not_intercepted(self, mock_interceptor, http_scope):
+        """Test that non-JSON payloads bypass the interceptor and are forwarded unchanged."""
+        http_scope["headers"] = [(b"content-type", b"text/plain")]
+        received = []
+
+        async def inner_app(scope, receive, send):
+            received.append(await receive())
+
+        wrapped_app = ASGITransportWrapper(mock_interceptor).wrap(inner_app)
+
+        async def receive():
+            return {"type": "http.request", "body": b"plain text", "more_body": False}
+
+        await wrapped_app(http_scope, receive, AsyncMock())
+
+        mock_interceptor.handle_incoming.assert_not_called()
+        assert received[0]["body"] == b"plain text"
+
     async def test_chunked_body_handling(self, mock_interceptor, mock_asgi_app, http_scope):
         """Test handling of chunked request bodies."""
         wrapper = ASGITransportWrapper(mock_interceptor)
@@ -184,6 +315,74 @@ class TestASGITransportWrapper:
 
     # Removed - admission control is an implementation detail
 
+    async def test_admission_accepts_session_object_lookup(
+        self, mock_interceptor, mock_admission_controller, mock_asgi_app, http_scope
+    ):
+        """Test that session_lookup may return the stored MCPSession instead of a dict."""
+        mock_interceptor.extract_session_id = Mock(return_value="test-session-123")
+        mock_admission_controller.has_session = Mock(return_value=False)
+        session = MCPSession(
+            id="test-session-123", status=SessionStatus.ACTIVE, client_id="c", server_id="s", capabilities={}
+        )
+
+        async def lookup(session_id):
+            return session if session_id == session.id else None
+
+        wrapper = ASGITransportWrapper(
+            mock_interceptor, admission_controller=mock_admission_controller, session_lookup=lookup
+        )
+        wrapped_app = wrapper.wrap(mock_asgi_app)
+
+        async def receive():
+            return {
+                "type": "http.request",
+                "body": json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/list"}).encode(),
+                "more_body": False,
+            }
+
+        await wrapped_app(http_scope, receive, AsyncMock())
+
+        mock_admission_controller.ensure_session_transport.assert_awaited_once_with("test-session-123")
+
+    async def test_concurrent_admissions_share_one_lookup(
+        self, mock_interceptor, mock_asgi_app, mock_admission_controller, http_scope
+    ):
+        """Test concurrent requests for the same cold session wait on a single admission."""
+        release = asyncio.Event()
+
+        async def slow_lookup(session_id):
+            await release.wait()
+            return None
+
+        lookup = AsyncMock(side_effect=slow_lookup)
+        mock_admission_controller.has_session = Mock(return_value=False)
+        mock_interceptor.extract_session_id = Mock(return_value="test-session-123")
+        wrapper = ASGITransportWrapper(
+            mock_interceptor, admission_controller=mock_admission_controller, session_lookup=lookup
+        )
+        wrapped_app = wrapper.wrap(mock_asgi_app)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        first = asyncio.create_task(wrapped_app(http_scope, receive, AsyncMock()))
+        second = asyncio.create_task(wrapped_app(http_scope, receive, AsyncMock()))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second)
+
+        lookup.assert_awaited_once_with("test-session-123")
+        assert not wrapper._admitting
+
+    async def test_warmed_sessions_bounded(self, mock_interceptor):
+        """Test the warmed-session set evicts the least recently warmed id past its cap."""
+        wrapper = ASGITransportWrapper(mock_interceptor, max_warmed_sessions=2)
+
+        for sid in ("a", "b", "a", "c"):
+            wrapper._mark_warmed(sid)
+
+        assert list(wrapper._warmed) == ["a", "c"]
+
     # Removed - session warming is implementation detail
 
     # Removed - session warming is implementation detail
@@ -207,6 +406,26 @@ class TestASGITransportWrapper:
         # Should not call interceptor for empty body
         mock_interceptor.handle_incoming.assert_not_called()
 
+    async def test_empty_body_message_is_mutable_dict(self, mock_interceptor, http_scope):
+        """Test the replayed empty-body message is a fresh dict that downstream apps may modify."""
+        messages = []
+
+        async def inner_app(scope, receive, send):
+            message = await receive()
+            message["body"] = b"rewritten"
+            messages.append(message)
+
+        wrapped_app = ASGITransportWrapper(mock_interceptor).wrap(inner_app)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        await wrapped_app(http_scope, receive, AsyncMock())
+        await wrapped_app(http_scope, receive, AsyncMock())
+
+        assert [type(m) for m in messages] == [dict, dict]
+        assert messages[0] is not messages[1]
+
     # Removed - session ID extraction is tested in other tests
 
     async def test_subsequent_receive_passthrough(self, mock_interceptor, http_scope):
@@ -238,3 +457,78 @@ class TestASGITransportWrapper:
 
         # Interceptor should only be called once for first body
         assert mock_interceptor.handle_incoming.call_count == 1
+
+
+class TestScanResponseHeaders:
+    """Test single-pass response header scanning."""
+
+    def test_content_type_and_session_id(self):
+        """Test header names are matched case-insensitively."""
+        headers = [(b"Content-Type", b"text/event-stream"), (b"Mcp-Session-Id", b"sid-1")]
+
+        assert _scan_response_headers(headers) == ("text/event-stream", "sid-1")
+
+    def test_prefers_mcp_session_id_over_alias(self):
+        """Test mcp-session-id wins over x-mcp-session-id regardless of order."""
+        headers = [(b"x-mcp-session-id", b"alias"), (b"mcp-session-id", b"primary")]
+
+        assert _scan_response_headers(headers) == ("", "primary")
+        assert _scan_response_headers([(b"x-mcp-session-id", b"alias")]) == ("", "alias")
+
+    def test_response_mode_classification(self):
+        """Test content types map to interception modes, including parameters and odd casing."""
+        assert _response_mode("application/json") == _MODE_JSON
+        assert _response_mode("application/json; charset=utf-8") == _MODE_JSON
+        assert _response_mode("text/event-stream") == _MODE_SSE
+        assert _response_mode("Text/Event-Stream") == _MODE_SSE
+        assert _response_mode("text/plain") == _MODE_SKIP
+        assert _response_mode("") == _MODE_SKIP
+
+
+class TestSSEDataDecoder:
+    """Test incremental SSE decoding."""
+
+    def test_event_split_across_chunks(self):
+        """Test an event is emitted only once its terminating blank line arrives."""
+        decoder = _SSEDataDecoder()
+
+        assert decoder.feed(b"event: message\nid: 1\nda") == []
+        assert decoder.feed(b'ta: {"a": 1}\r\n') == []
+        assert decoder.feed(b"\r\n") == [b'{"a": 1}']
+
+    def test_multiple_events_and_data_lines(self):
+        """Test multi-line data is joined with newlines and events are split on blank lines."""
+        decoder = _SSEDataDecoder()
+
+        events = decoder.feed(b"data: one\ndata: two\n\n: comment\n\ndata:three\n\n")
+
+        assert events == [b"one\ntwo", b"three"]
+
+    def test_flush_pending_event(self):
+        """Test flush dispatches data left when the stream ends without a blank line."""
+        decoder = _SSEDataDecoder()
+
+        assert decoder.feed(b"data: tail") == []
+        assert decoder.flush() == [b"tail"]
+        assert decoder.flush() == []
+
+
+class TestLazyHeaders:
+    """Test the lazily decoded request header view."""
+
+    def test_case_insensitive_lookup(self):
+        """Test lookups ignore case and the last duplicate wins."""
+        headers = _LazyHeaders([(b"Content-Type", b"application/json"), (b"X-Dup", b"1"), (b"x-dup", b"2")])
+
+        assert headers["content-type"] == "application/json"
+        assert headers.get("X-DUP") == "2"
+        assert headers.get("missing") is None
+        assert "mcp-session-id" not in headers
+
+    def test_iteration_matches_decoded_dict(self):
+        """Test iteration and items() expose lowercased names like the eager dict did."""
+        headers = _LazyHeaders([(b"Mcp-Session-Id", b"sid"), (b"Accept", b"*/*")])
+
+        assert dict(headers.items()) == {"mcp-session-id": "sid", "accept": "*/*"}
+        assert len(headers) == 2
+        assert headers["MCP-SESSION-ID"] == "sid"
@@ -42,3 +42,19 @@ async def test_replay_missing_event_returns_none():
         pytest.fail("callback should not be invoked for missing last_event_id")
 
     assert await store.replay_events_after("does-not-exist", cb) is None
+
+
+@pytest.mark.asyncio
+async def test_replay_after_eviction_uses_stream_position():
+    store = InMemoryEventStore(max_events_per_stream=3)
+    ids = [await store.store_event("s", JSONRPCMessage(jsonrpc="2.0", id=i, method="m")) for i in range(5)]
+
+    seen: list[EventMessage] = []
+
+    async def cb(ev: EventMessage):
+        seen.append(ev)
+
+    # ids[0] and ids[1] were evicted; ids[2] is the oldest retained event
+    assert await store.replay_events_after(ids[0], cb) is None
+    assert await store.replay_events_after(ids[2], cb) == "s"
+    assert [ev.event_id for ev in seen] == ids[3:]
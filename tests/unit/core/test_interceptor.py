@@ -1,11 +1,15 @@
 """Unit tests for ProtocolInterceptor."""
 
 import json
+from unittest.mock import patch
 
 import pytest
 
+from mcp_db.core.asgi_wrapper import _LazyHeaders
 from mcp_db.core.interceptor import ProtocolInterceptor
-from mcp_db.core.models import MCPSession, SessionStatus
+from mcp_db.core.models import BaseEvent, MCPSession, SessionStatus
+from mcp_db.session.redis_adapter import JSONCodec
+from mcp_db.utils import serialization
 
 
 @pytest.mark.asyncio
@@ -21,6 +25,17 @@ class TestProtocolInterceptor:
         assert "_raw" in result
         assert result["_raw"] == "not-valid-json{"
 
+    async def test_handle_incoming_bytes(self, mock_session_manager, tools_call_request):
+        """Test raw request bodies are parsed without decoding to str first."""
+        interceptor = ProtocolInterceptor(mock_session_manager)
+
+        result = await interceptor.handle_incoming(json.dumps(tools_call_request).encode(), {})
+
+        assert result == tools_call_request
+
+        raw = await interceptor.handle_incoming(b"not-valid-json{", {})
+        assert raw == {"_raw": b"not-valid-json{"}
+
     async def test_handle_incoming_initialize(self, mock_session_manager, initialize_request):
         """Test handling initialize request."""
         interceptor = ProtocolInterceptor(mock_session_manager)
@@ -110,6 +125,57 @@ class TestProtocolInterceptor:
         # Should append events
         assert mock_session_manager.append_event.call_count >= 1
 
+    async def test_raw_response_recorded_without_parsing(self, mock_session_manager, tools_call_request):
+        """Test raw response bytes are recorded as-is and non-JSON bytes are passed through."""
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        context = {"headers": {"mcp-session-id": "sess-789"}}
+
+        raw = ('{"jsonrpc":"2.0","id":%s,"result":{"content":[]}}' % json.dumps(tools_call_request["id"])).encode()
+        assert await interceptor.handle_outgoing("sess-789", raw, context) is raw
+        assert await interceptor.handle_outgoing("sess-789", b"not json", context) == b"not json"
+
+        events = [call[0][0] for call in mock_session_manager.append_event.call_args_list]
+        assert [e.event_type for e in events] == ["MessageSentEvent"]
+        assert events[0].payload["response"] == raw.decode()
+
+    async def test_raw_response_event_round_trips_through_codec(self, mock_session_manager, monkeypatch):
+        """Test an event recorded from raw bytes encodes and decodes with the stdlib JSON fallback."""
+        monkeypatch.setattr(serialization, "_orjson", None)
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        raw = b'{"jsonrpc":"2.0","id":1,"result":{"text":"caf\xc3\xa9"}}'
+
+        await interceptor.handle_outgoing("sess-789", raw, {})
+
+        event = mock_session_manager.append_event.call_args[0][0]
+        codec = JSONCodec()
+        decoded = codec.decode(codec.encode(event), BaseEvent)
+        assert decoded.payload == {"response": raw.decode()}
+        assert json.loads(decoded.payload["response"])["result"]["text"] == "caf\u00e9"
+
+    async def test_raw_response_nested_method_is_not_top_level(self, mock_session_manager):
+        """Test a "method" key inside a raw result doesn't close the session."""
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        context = {"headers": {"mcp-session-id": "sess-789"}}
+
+        leading = b'{"jsonrpc":"2.0","id":1,"result":{"method":"server/disconnect"}}'
+        trailing = b'{"result":{"method":"server/disconnect"},"jsonrpc":"2.0","id":99}'
+        await interceptor.handle_outgoing("sess-789", leading, context)
+        await interceptor.handle_outgoing("sess-789", trailing, context)
+
+        events = [call[0][0] for call in mock_session_manager.append_event.call_args_list]
+        assert [e.event_type for e in events] == ["MessageSentEvent", "MessageSentEvent"]
+        mock_session_manager.update.assert_not_called()
+
+    async def test_handle_outgoing_skips_session_lookup_after_other_methods(self, mock_session_manager):
+        """Test non-initialize responses don't read the session from storage."""
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        context = {"_mcp_db_last_method": "tools/call"}
+
+        await interceptor.handle_outgoing("sess-1", {"jsonrpc": "2.0", "id": 1, "result": {}}, context)
+
+        mock_session_manager.get.assert_not_called()
+        mock_session_manager.create.assert_not_called()
+
     async def test_handle_outgoing_update_existing_session(self, mock_session_manager, initialize_response):
         """Test updating existing session on initialize response."""
         # Existing session
@@ -213,3 +279,40 @@ class TestProtocolInterceptor:
 
         session_id = interceptor._extract_session_id(request, context)
         assert session_id is None
+
+    async def test_extract_session_id_non_dict_params(self, mock_session_manager):
+        """Test positional (list) params fall back to headers instead of raising."""
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        context = {"headers": {"mcp-session-id": "header-sess-id"}}
+
+        assert interceptor.extract_session_id({"params": ["a", "b"]}, context) == "header-sess-id"
+
+    async def test_extract_session_id_without_payload_scans_headers_once(self, mock_session_manager):
+        """Test payload-less extraction falls back to headers and memoizes the scan per context."""
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        headers = {"Mcp-Session-Id": "header-sess-id"}
+        context = {"headers": headers}
+
+        assert interceptor.extract_session_id(None, context) == "header-sess-id"
+        # Memoized per headers object: a later change to the same dict isn't rescanned
+        headers["Mcp-Session-Id"] = "changed"
+        assert interceptor.extract_session_id({"jsonrpc": "2.0"}, context) == "header-sess-id"
+        assert interceptor.extract_session_id({"params": {"session_id": "p"}}, context) == "p"
+
+    async def test_extract_session_id_lazy_headers_not_decoded(self, mock_session_manager):
+        """Test the wrapper's lazy header view is read by direct lookups without decoding every header."""
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        headers = _LazyHeaders([(b"Accept", b"*/*"), (b"Last-Event-ID", b"evt-1"), (b"Mcp-Session-Id", b"sid")])
+
+        with patch.object(_LazyHeaders, "_decoded", side_effect=AssertionError("decoded all headers")) as decoded:
+            assert interceptor.extract_session_id(None, {"headers": headers}) == "sid"
+        decoded.assert_not_called()
+
+    async def test_extract_session_id_mixed_case_headers_keep_precedence(self, mock_session_manager):
+        """Test a mixed-case mcp-session-id still wins over lower-cased alias and SSE headers."""
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        headers = {"Mcp-Session-Id": "primary-id", "x-mcp-session-id": "alias-id", "last-event-id": "evt-1"}
+
+        assert interceptor.extract_session_id(None, {"headers": headers}) == "primary-id"
+        headers = {"X-MCP-Session-Id": "alias-id", "last-event-id": "evt-1"}
+        assert interceptor.extract_session_id(None, {"headers": headers}) == "alias-id"
@@ -112,6 +112,15 @@ class TestMCPSession:
         assert reconstructed.capabilities == original.capabilities
         assert reconstructed.metadata == original.metadata
 
+    def test_session_status_normalized_from_string(self):
+        """Test plain string statuses (e.g. decoded from storage) become SessionStatus members."""
+        session = MCPSession(id="s", status="ACTIVE", client_id="c", server_id="srv", capabilities={})
+
+        assert session.status is SessionStatus.ACTIVE
+
+        unknown = MCPSession(id="s", status="CUSTOM", client_id="c", server_id="srv", capabilities={})
+        assert unknown.status == "CUSTOM"
+
 
 class TestBaseEvent:
     """Test BaseEvent/MCPEvent dataclass."""
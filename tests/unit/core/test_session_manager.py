@@ -1,9 +1,12 @@
 """Unit tests for SessionManager."""
 
+import dataclasses
+
 import pytest
 
 from mcp_db.core.models import BaseEvent, SessionStatus
 from mcp_db.core.session_manager import SessionManager
+from mcp_db.utils.resilience import CircuitBreaker, CircuitBreakerConfig
 
 
 @pytest.mark.asyncio
@@ -70,6 +73,49 @@ class TestSessionManager:
         # Verify storage was updated
         mock_storage.update_session.assert_called_once_with(sample_session.id, updates)
 
+    async def test_negative_cache_absorbs_repeated_misses(self, mock_storage, mock_event_store, sample_session):
+        """Test misses are remembered when enabled and cleared by create."""
+        mock_storage.get_session.return_value = None
+        manager = SessionManager(
+            storage=mock_storage, event_store=mock_event_store, use_local_cache=True, negative_cache_ttl=5.0
+        )
+
+        assert await manager.get(sample_session.id) is None
+        assert await manager.get(sample_session.id) is None
+        assert mock_storage.get_session.call_count == 1
+
+        await manager.create(sample_session)
+        assert await manager.get(sample_session.id) is sample_session
+        assert mock_storage.get_session.call_count == 1
+
+    async def test_update_caches_stored_session(self, mock_storage, mock_event_store, sample_session):
+        """Test update caches the session the storage returns without a second storage read."""
+        mock_storage.get_session.return_value = sample_session
+        stored = dataclasses.replace(
+            sample_session, status=SessionStatus.CLOSED, updated_at=sample_session.updated_at + 1
+        )
+        mock_storage.update_session.return_value = stored
+        manager = SessionManager(storage=mock_storage, event_store=mock_event_store, use_local_cache=True)
+        await manager.get(sample_session.id)
+
+        await manager.update(sample_session.id, {"status": SessionStatus.CLOSED})
+
+        assert await manager.get(sample_session.id) is stored
+        assert mock_storage.get_session.call_count == 1
+
+    async def test_update_of_missing_session_drops_cache(self, mock_storage, mock_event_store, sample_session):
+        """Test a session deleted elsewhere isn't served from cache after an update that applied nothing."""
+        mock_storage.get_session.return_value = sample_session
+        mock_storage.update_session.return_value = None
+        manager = SessionManager(storage=mock_storage, event_store=mock_event_store, use_local_cache=True)
+        await manager.get(sample_session.id)
+
+        await manager.update(sample_session.id, {"status": SessionStatus.CLOSED})
+        mock_storage.get_session.return_value = None
+
+        assert await manager.get(sample_session.id) is None
+        assert mock_storage.get_session.call_count == 2
+
     async def test_delete_session(self, mock_storage, mock_event_store):
         """Test deleting a session."""
         manager = SessionManager(storage=mock_storage, event_store=mock_event_store)
@@ -124,3 +170,22 @@ class TestSessionManager:
             assert False, "Should have raised an exception"
         except Exception as e:
             assert "Storage error" in str(e) or "circuit_open" in str(e)
+
+    async def test_retries_count_as_one_breaker_call(self, mock_storage, mock_event_store, sample_session):
+        """Test a retried storage op records one breaker outcome, and an open breaker skips storage."""
+        breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=1, reset_timeout_seconds=60))
+        mock_storage.get_session.side_effect = [Exception("transient"), sample_session]
+        manager = SessionManager(
+            storage=mock_storage, event_store=mock_event_store, circuit_breaker=breaker, retry_backoff_ms=[0]
+        )
+
+        assert await manager.get("test-123") == sample_session
+        assert mock_storage.get_session.await_count == 2
+
+        mock_storage.delete_session.side_effect = Exception("down")
+        with pytest.raises(Exception, match="down"):
+            await manager.delete("test-123")
+        assert mock_storage.delete_session.await_count == 3
+        with pytest.raises(RuntimeError, match="circuit_open"):
+            await manager.delete("test-123")
+        assert mock_storage.delete_session.await_count == 3
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from mcp_db.core.interceptor import ProtocolInterceptor
 from mcp_db.core.wrapper import MCPStorageWrapper
 
 
@@ -45,3 +46,20 @@ class TestMCPStorageWrapper:
         mock_interceptor.handle_incoming.assert_called_once()
         mock_server.handle_message.assert_called_once_with({"method": "test"})
         mock_interceptor.handle_outgoing.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_handle_raw_reuses_incoming_session_id(self, mock_session_manager):
+        """Test handle_raw uses the session id resolved by handle_incoming instead of extracting it again."""
+        mock_server = Mock()
+        mock_server.handle_message = AsyncMock(return_value={"jsonrpc": "2.0", "id": 1, "result": {}})
+        interceptor = ProtocolInterceptor(mock_session_manager)
+        interceptor.extract_session_id = Mock(wraps=interceptor.extract_session_id)
+        interceptor.handle_outgoing = AsyncMock(return_value={"result": "ok"})
+        context = {"headers": {"mcp-session-id": "sess-123"}}
+
+        wrapper = MCPStorageWrapper(server=mock_server, interceptor=interceptor)
+        await wrapper.handle_raw('{"jsonrpc": "2.0", "id": 1, "method": "tools/list"}', context)
+
+        interceptor.extract_session_id.assert_called_once()
+        assert interceptor.handle_outgoing.call_args[0][0] == "sess-123"
+        assert "_mcp_db_incoming_sid" not in context
@@ -1,5 +1,8 @@
 """Unit tests for StorageAdapter and InMemoryStorage."""
 
+import subprocess
+import sys
+
 import pytest
 
 from mcp_db.core.models import BaseEvent, MCPSession, SessionStatus
@@ -30,6 +33,12 @@ class TestStorageAdapterInterface:
         with pytest.raises(TypeError):
             StorageAdapter()
 
+    @pytest.mark.parametrize("module", ["mcp_db.session", "mcp_db.session.redis_adapter"])
+    def test_importable_first(self, module):
+        """Test storage modules import in a fresh interpreter without a circular import through mcp_db.core."""
+        result = subprocess.run([sys.executable, "-c", f"import {module}"], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
 
 @pytest.mark.asyncio
 class TestInMemoryStorage:
@@ -63,9 +72,13 @@ class TestInMemoryStorage:
         assert retrieved.capabilities == {"tools": True}
 
         # Update
-        await storage.update_session(session.id, {"status": SessionStatus.ACTIVE, "metadata": {"updated": True}})
+        returned = await storage.update_session(
+            session.id, {"status": SessionStatus.ACTIVE, "metadata": {"updated": True}}
+        )
+        assert await storage.update_session("missing", {"status": SessionStatus.ACTIVE}) is None
 
         updated = await storage.get_session(session.id)
+        assert returned is updated
         assert updated.status == SessionStatus.ACTIVE
         assert updated.metadata == {"updated": True}
 
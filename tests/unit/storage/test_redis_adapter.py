@@ -0,0 +1,319 @@
+"""Unit tests for RedisStorage against a mocked Redis client."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import redis.asyncio as redis_asyncio
+
+from mcp_db.core.models import BaseEvent, SessionStatus
+from mcp_db.session.redis_adapter import JSONCodec, RedisStorage
+from mcp_db.utils.serialization import json_loads
+
+
+@pytest.fixture
+def storage(mock_redis_client):
+    """RedisStorage wired to the mocked client (no server needed)."""
+    store = RedisStorage(prefix="test")
+    store._redis = mock_redis_client
+    store._append_script = AsyncMock(return_value=b"1-0")
+    store._update_script = AsyncMock(return_value=1)
+    mock_redis_client.hget = AsyncMock(return_value=None)
+    return store
+
+
+def _stream(entries):
+    """Fake XRANGE over (stream id, fields) entries honouring `-`, inclusive and `(` exclusive bounds."""
+
+    async def xrange(key, min="-", max="+", count=None):
+        if min == "-":
+            selected = entries
+        elif min.startswith("("):
+            selected = [e for e in entries if e[0].decode() > min[1:]]
+        else:
+            selected = [e for e in entries if e[0].decode() >= min]
+        return selected[:count]
+
+    return xrange
+
+
+@pytest.mark.asyncio
+class TestRedisStorage:
+    """Test RedisStorage encoding and stream reads."""
+
+    async def test_session_round_trip(self, storage, mock_redis_client, sample_session):
+        """Test sessions are stored as codec bytes and decoded back with an enum status."""
+        await storage.create_session(sample_session)
+        key, raw = mock_redis_client.set.call_args[0]
+        assert key == f"test:session:{sample_session.id}"
+        assert isinstance(raw, bytes)
+        assert json_loads(raw)["status"] == sample_session.status.value
+
+        mock_redis_client.get.return_value = raw
+        loaded = await storage.get_session(sample_session.id)
+        assert loaded == sample_session
+        assert isinstance(loaded.status, SessionStatus)
+
+    async def test_custom_codec(self, mock_redis_client, sample_session):
+        """Test any object with encode/decode (not only JSONCodec) stores and loads sessions."""
+
+        class PrefixedCodec:
+            def encode(self, obj):
+                return b"v1:" + JSONCodec().encode(obj)
+
+            def decode(self, data, cls):
+                return JSONCodec().decode(data.removeprefix(b"v1:"), cls)
+
+        store = RedisStorage(prefix="test", codec=PrefixedCodec())
+        store._redis = mock_redis_client
+        await store.create_session(sample_session)
+        raw = mock_redis_client.set.call_args[0][1]
+        assert raw.startswith(b"v1:")
+
+        mock_redis_client.get.return_value = raw
+        assert await store.get_session(sample_session.id) == sample_session
+
+    async def test_update_session_applies_fields(self, storage, mock_redis_client, sample_session):
+        """Test updates are merged into the stored session and written with compare-and-set."""
+        raw = JSONCodec().encode(sample_session)
+        mock_redis_client.get.return_value = raw
+
+        before = sample_session.updated_at
+        updated = await storage.update_session(sample_session.id, {"status": SessionStatus.CLOSED})
+
+        assert updated.status == SessionStatus.CLOSED
+        assert updated.updated_at >= before
+        kwargs = storage._update_script.call_args.kwargs
+        assert kwargs["keys"] == [f"test:session:{sample_session.id}"]
+        assert kwargs["args"][0] == raw
+        stored = json_loads(kwargs["args"][1])
+        assert stored["status"] == "CLOSED"
+        assert stored["updated_at"] == updated.updated_at
+        assert stored["client_id"] == sample_session.client_id
+        mock_redis_client.set.assert_not_awaited()
+
+    async def test_update_session_remerges_on_conflict(self, storage, mock_redis_client, sample_session):
+        """Test a concurrent write is merged into rather than overwritten."""
+        codec = JSONCodec()
+        mock_redis_client.get.return_value = codec.encode(sample_session)
+        sample_session.metadata = {"other": "writer"}
+        newer = codec.encode(sample_session)
+        storage._update_script.side_effect = [newer, 1]
+
+        await storage.update_session(sample_session.id, {"status": SessionStatus.CLOSED})
+
+        assert storage._update_script.await_count == 2
+        raw, written = storage._update_script.call_args.kwargs["args"]
+        assert raw == newer
+        assert json_loads(written)["metadata"] == {"other": "writer"}
+        assert json_loads(written)["status"] == "CLOSED"
+
+    async def test_update_uses_cached_bytes(self, storage, mock_redis_client, sample_session):
+        """Test updates after a create skip the GET, and a deleted session drops its cached bytes."""
+        await storage.create_session(sample_session)
+        created = mock_redis_client.set.call_args[0][1]
+
+        await storage.update_session(sample_session.id, {"status": SessionStatus.ACTIVE})
+        mock_redis_client.get.assert_not_awaited()
+        assert storage._update_script.call_args.kwargs["args"][0] == created
+        updated = storage._update_script.call_args.kwargs["args"][1]
+
+        # Removed by another node: the script finds nothing and the cache entry is dropped
+        storage._update_script.return_value = None
+        await storage.update_session(sample_session.id, {"status": SessionStatus.CLOSED})
+        assert storage._update_script.call_args.kwargs["args"][0] == updated
+        await storage.update_session(sample_session.id, {"status": SessionStatus.CLOSED})
+        mock_redis_client.get.assert_awaited_once()
+
+    async def test_update_missing_session_is_noop(self, storage, mock_redis_client):
+        """Test updating an unknown session writes nothing."""
+        assert await storage.update_session("missing", {"status": SessionStatus.CLOSED}) is None
+
+        storage._update_script.assert_not_awaited()
+
+    async def test_delete_session_single_command(self, storage, mock_redis_client):
+        """Test the session and its event stream are deleted in one call."""
+        await storage.delete_session("s1")
+
+        mock_redis_client.delete.assert_awaited_once_with("test:session:s1", "test:events:s1", "test:eventidx:s1")
+
+    async def test_short_keys(self, mock_redis_client):
+        """Test the abbreviated key layout."""
+        store = RedisStorage(prefix="test:", short_keys=True)
+        store._redis = mock_redis_client
+
+        await store.delete_session("s1")
+        await store.acquire_lock("job", 1.0)
+
+        mock_redis_client.delete.assert_awaited_once_with("test:s:s1", "test:e:s1", "test:i:s1")
+        assert mock_redis_client.set.call_args[0][0] == "test:l:job"
+
+    async def test_bounded_connection_pool(self):
+        """Test max_connections configures a blocking pool that hands back raw bytes."""
+        store = RedisStorage(max_connections=4, pool_timeout=2.5)
+
+        pool = store._redis.connection_pool
+        assert isinstance(pool, redis_asyncio.BlockingConnectionPool)
+        assert pool.max_connections == 4
+        assert pool.timeout == 2.5
+        assert pool.connection_kwargs["decode_responses"] is False
+
+    async def test_bounded_connection_pool_keeps_finite_default_timeout(self):
+        """Test an unset pool_timeout leaves redis-py's finite wait instead of blocking forever."""
+        store = RedisStorage(max_connections=4)
+
+        timeout = store._redis.connection_pool.timeout
+        assert timeout is not None
+        assert timeout == redis_asyncio.BlockingConnectionPool(max_connections=4).timeout
+
+    async def test_get_events_after_event_id(self, storage, mock_redis_client):
+        """Test legacy entries are decoded and resume strictly after the given event."""
+        codec = JSONCodec()
+        events = [BaseEvent(event_id=f"e{i}", session_id="s", event_type="T", payload={"i": i}) for i in range(3)]
+        entries = [
+            (f"1-{i}".encode(), {b"event": codec.encode(ev), b"event_id": ev.event_id.encode()})
+            for i, ev in enumerate(events)
+        ]
+        mock_redis_client.xrange.side_effect = _stream(entries)
+
+        assert [ev.event_id async for ev in storage.get_events("s")] == ["e0", "e1", "e2"]
+        resumed = [ev async for ev in storage.get_events("s", after_event_id="e0")]
+        assert [ev.payload for ev in resumed] == [{"i": 1}, {"i": 2}]
+        assert [ev.event_id async for ev in storage.get_events("s", after_event_id="missing")] == ["e0", "e1", "e2"]
+
+        # Indexed events resume with a single HGET instead of scanning the stream
+        mock_redis_client.hget.return_value = b"1-1"
+        mock_redis_client.xrange.side_effect = _stream(entries)
+        mock_redis_client.xrange.reset_mock()
+        assert [ev.event_id async for ev in storage.get_events("s", after_event_id="e1")] == ["e2"]
+        mock_redis_client.hget.assert_awaited_with("test:eventidx:s", "e1")
+        assert mock_redis_client.xrange.call_args_list[0].kwargs["min"] == "(1-1"
+
+    async def test_append_event_indexes_in_one_call(self, storage, sample_event):
+        """Test appends run the XADD + index script once with the encoded event."""
+        await storage.append_event(sample_event)
+
+        kwargs = storage._append_script.call_args.kwargs
+        sid = sample_event.session_id
+        assert kwargs["keys"] == [f"test:events:{sid}", f"test:eventidx:{sid}"]
+        assert kwargs["args"][1:] == [sample_event.event_id, ""]
+        assert json_loads(kwargs["args"][0])["event_id"] == sample_event.event_id
+
+    async def test_get_events_compact_entries(self, storage, mock_redis_client):
+        """Test entries with only the short event field decode with the id from the payload."""
+        codec = JSONCodec()
+        legacy = BaseEvent(event_id="old", session_id="s", event_type="T")
+        current = BaseEvent(event_id="new", session_id="s", event_type="T", payload={"k": 1})
+        entries = [
+            (b"1-0", {b"event": codec.encode(legacy), b"event_id": b"old"}),
+            (b"1-1", {b"e": codec.encode(current)}),
+        ]
+        mock_redis_client.xrange.side_effect = _stream(entries)
+
+        events = [ev async for ev in storage.get_events("s")]
+
+        assert [ev.event_id for ev in events] == ["old", "new"]
+        assert events[1].payload == {"k": 1}
+
+    async def test_batched_events_flush_in_one_pipeline(self, mock_redis_client, sample_event):
+        """Test batched appends are buffered, then written by one pipeline when the batch fills or times out."""
+        store = RedisStorage(prefix="test", stream_maxlen=50, event_batch_size=2, event_flush_interval_ms=1)
+        store._redis = mock_redis_client
+        store._append_script = AsyncMock()
+        pipe = Mock()
+        pipe.execute = AsyncMock()
+        mock_redis_client.pipeline = Mock(return_value=pipe)
+
+        await store.append_event(sample_event)
+        pipe.execute.assert_not_awaited()
+        await store.append_event(sample_event)
+
+        pipe.execute.assert_awaited_once()
+        assert store._append_script.await_count == 2
+        assert store._append_script.call_args.kwargs["client"] is pipe
+        assert store._append_script.call_args.kwargs["args"][2] == 50
+
+        await store.append_event(sample_event)
+        await asyncio.sleep(0.05)
+        assert pipe.execute.await_count == 2
+        assert store._append_script.await_count == 3
+
+    async def test_failed_flush_requeues_events(self, mock_redis_client):
+        """Test events from a failed pipeline are kept, in order, and written by the next flush."""
+        store = RedisStorage(prefix="test", event_batch_size=10, event_flush_interval_ms=60_000)
+        store._redis = mock_redis_client
+        store._append_script = AsyncMock()
+        pipe = Mock()
+        pipe.execute = AsyncMock(side_effect=[ConnectionError("down"), None])
+        mock_redis_client.pipeline = Mock(return_value=pipe)
+
+        first = BaseEvent(event_id="e1", session_id="s", event_type="T")
+        second = BaseEvent(event_id="e2", session_id="s", event_type="T")
+        await store.append_event(first)
+        with pytest.raises(ConnectionError):
+            await store.flush()
+        await store.append_event(second)
+        assert [args[1] for _, args in store._pending] == ["e1", "e2"]
+
+        store._append_script.reset_mock()
+        await store.flush()
+        assert store._pending == []
+        assert [c.kwargs["args"][1] for c in store._append_script.call_args_list] == ["e1", "e2"]
+        assert pipe.execute.await_count == 2
+        store._flush_task.cancel()
+
+    async def test_flush_cancelled_during_execute_is_not_requeued(self, mock_redis_client):
+        """Test a batch whose pipeline was already sent is not resent after cancellation."""
+        store = RedisStorage(prefix="test", event_batch_size=10, event_flush_interval_ms=60_000)
+        store._redis = mock_redis_client
+        store._append_script = AsyncMock()
+        started = asyncio.Event()
+
+        async def execute():
+            started.set()
+            await asyncio.sleep(60)
+
+        pipe = Mock()
+        pipe.execute = execute
+        mock_redis_client.pipeline = Mock(return_value=pipe)
+
+        await store.append_event(BaseEvent(event_id="e1", session_id="s", event_type="T"))
+        store._flush_task.cancel()
+        flushing = asyncio.create_task(store.flush())
+        await started.wait()
+        flushing.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flushing
+        assert store._pending == []
+
+    async def test_failed_background_flush_retries(self, mock_redis_client):
+        """Test the flush timer reschedules itself after a failure until the batch is written."""
+        store = RedisStorage(prefix="test", event_batch_size=10, event_flush_interval_ms=1)
+        store._redis = mock_redis_client
+        store._append_script = AsyncMock()
+        pipe = Mock()
+        pipe.execute = AsyncMock(side_effect=[ConnectionError("down"), ConnectionError("down"), None])
+        mock_redis_client.pipeline = Mock(return_value=pipe)
+
+        await store.append_event(BaseEvent(event_id="e1", session_id="s", event_type="T"))
+        for _ in range(100):
+            if pipe.execute.await_count == 3:
+                break
+            await asyncio.sleep(0.01)
+
+        assert pipe.execute.await_count == 3
+        assert store._pending == []
+        assert [c.kwargs["args"][1] for c in store._append_script.call_args_list][-1] == "e1"
+
+    async def test_get_events_pages_until_short_page(self, storage, mock_redis_client, monkeypatch):
+        """Test history is read in full pages and a short page ends the read without an extra XRANGE."""
+        monkeypatch.setattr("mcp_db.session.redis_adapter._EVENTS_PAGE_SIZE", 2)
+        codec = JSONCodec()
+        entries = [
+            (f"1-{i}".encode(), {b"event": codec.encode(BaseEvent(event_id=f"e{i}", session_id="s", event_type="T"))})
+            for i in range(3)
+        ]
+        mock_redis_client.xrange.side_effect = _stream(entries)
+
+        assert [ev.event_id async for ev in storage.get_events("s")] == ["e0", "e1", "e2"]
+        assert [c.kwargs["min"] for c in mock_redis_client.xrange.call_args_list] == ["-", "(1-1"]
@@ -0,0 +1,34 @@
+"""Unit tests for event loop selection helpers."""
+
+import asyncio
+import sys
+import types
+
+from mcp_db.utils.eventloop import install_uvloop, preferred_loop, uvloop_available
+
+
+class TestEventLoopHelpers:
+    """Test optional uvloop selection."""
+
+    def test_without_uvloop(self, monkeypatch):
+        """Test the helpers fall back to asyncio when uvloop can't be imported."""
+        monkeypatch.setitem(sys.modules, "uvloop", None)
+
+        assert uvloop_available() is False
+        assert preferred_loop() == "asyncio"
+        assert install_uvloop() is False
+
+    def test_with_uvloop(self, monkeypatch):
+        """Test uvloop is preferred and installed as the loop policy when importable."""
+        policy = asyncio.DefaultEventLoopPolicy()
+        fake = types.ModuleType("uvloop")
+        fake.EventLoopPolicy = lambda: policy
+        fake.install = lambda: asyncio.set_event_loop_policy(policy)
+        monkeypatch.setitem(sys.modules, "uvloop", fake)
+        original = asyncio.get_event_loop_policy()
+        try:
+            assert preferred_loop() == "uvloop"
+            assert install_uvloop() is True
+            assert asyncio.get_event_loop_policy() is policy
+        finally:
+            asyncio.set_event_loop_policy(original)
@@ -0,0 +1,109 @@
+"""Unit tests for JSON serialization helpers."""
+
+import pytest
+
+from mcp_db.core.models import MCPSession, SessionStatus
+from mcp_db.utils import serialization
+from mcp_db.utils.serialization import (
+    json_dumps,
+    json_loads,
+    json_loads_async,
+    peek_jsonrpc_fields,
+    peek_jsonrpc_method,
+)
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "orjson":
+        if serialization._orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(serialization, "_orjson", None)
+    return request.param
+
+
+class TestJSONHelpers:
+    """Test json_dumps/json_loads."""
+
+    def test_dumps_returns_compact_bytes(self, backend):
+        """Test that dumps emits compact UTF-8 bytes."""
+        out = json_dumps({"jsonrpc": "2.0", "params": {"name": "é"}})
+        assert isinstance(out, bytes)
+        assert out == '{"jsonrpc":"2.0","params":{"name":"é"}}'.encode("utf-8")
+
+    def test_loads_accepts_bytes_str_and_memoryview(self, backend):
+        """Test that loads accepts every supported input type."""
+        payload = b'{"id": 1, "method": "ping"}'
+        expected = {"id": 1, "method": "ping"}
+        assert json_loads(payload) == expected
+        assert json_loads(bytearray(payload)) == expected
+        assert json_loads(memoryview(payload)) == expected
+        assert json_loads(payload.decode()) == expected
+
+    def test_loads_invalid_raises_value_error(self, backend):
+        """Test that invalid input raises a ValueError subclass on both backends."""
+        with pytest.raises(ValueError):
+            json_loads(b"not-json{")
+
+    def test_round_trip(self, backend):
+        """Test dumps/loads round trip."""
+        obj = {"a": [1, 2.5, None, True], "b": {"c": "d"}}
+        assert json_loads(json_dumps(obj)) == obj
+
+    def test_dumps_dataclass(self, backend):
+        """Test dataclass instances (slotted, with enum fields) encode as JSON objects."""
+        session = MCPSession(id="s", status=SessionStatus.ACTIVE, client_id="c", server_id="x", capabilities={})
+        data = json_loads(json_dumps({"session": session}))["session"]
+        assert data["status"] == "ACTIVE"
+        assert MCPSession(**data) == session
+
+    @pytest.mark.asyncio
+    async def test_loads_async_inline_and_offloaded(self, backend):
+        """Test async loads gives the same result whether parsed inline or in a worker thread."""
+        payload = json_dumps({"result": {"text": "x" * 100}})
+        assert await json_loads_async(payload) == json_loads(payload)
+        assert await json_loads_async(payload, offload_threshold=10) == json_loads(payload)
+        with pytest.raises(ValueError):
+            await json_loads_async(b"not-json{", offload_threshold=1)
+
+
+class TestPeekJsonrpcMethod:
+    """Test targeted extraction of the JSON-RPC method from raw bodies."""
+
+    @pytest.mark.parametrize(
+        ("body", "expected"),
+        [
+            (b'{"jsonrpc": "2.0", "id": 1, "method": "initialize"}', "initialize"),
+            (b'{"method":"tools/call","params":{}}', "tools/call"),
+            (b'{"method": "a\\"b"}', 'a"b'),
+            (b'{"jsonrpc": "2.0", "id": 1, "result": {}}', None),
+            (b"", None),
+            (b'{"method": "broken', None),
+            (b'{"jsonrpc":"2.0","id":1,"result":{"method":"server/disconnect"}}', None),
+            (b'{"id":1,"params":{"method":"nested"},"method":"tools/call"}', "tools/call"),
+            (b'{"id":1,"result":[{"method":"nested"}]}', None),
+        ],
+    )
+    def test_peek(self, body, expected):
+        """Test method extraction with regex fast path and parse fallback."""
+        assert peek_jsonrpc_method(body) == expected
+
+    @pytest.mark.parametrize(
+        ("data", "expected"),
+        [
+            (b'{"jsonrpc":"2.0","id":7,"result":{"id":"nested"}}', {"jsonrpc": "2.0", "id": 7}),
+            (b'{"id": "abc", "method": "ping"}', {"jsonrpc": "2.0", "id": "abc", "method": "ping"}),
+            (
+                b'{"jsonrpc":"2.0","method":"notifications/progress"}',
+                {"jsonrpc": "2.0", "method": "notifications/progress"},
+            ),
+            (b'{"result": {"id": 3}, "id": 4}', {"jsonrpc": "2.0"}),
+            (b"not json", None),
+            (b'{"id":1,"result":{"method":"server/disconnect"}}', {"jsonrpc": "2.0", "id": 1}),
+        ],
+    )
+    def test_peek_fields(self, data, expected):
+        """Test routing-field extraction only reports a leading top-level id."""
+        assert peek_jsonrpc_fields(data) == expected